@@ -45,6 +45,8 @@ from .blas       import *
 from .arith      import *
 from .statistics import *
 from .lapack     import *
+from .solvers    import *
+from .sparse     import *
 from .signal     import *
 from .image      import *
 from .features   import *
@@ -58,3 +60,4 @@ del ct
 del inspect
 del numbers
 del os
+del sys
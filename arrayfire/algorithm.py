@@ -115,6 +115,38 @@ def max(a, dim=None):
     else:
         return _reduce_all(a, backend.get().af_max_all)
 
+def minmax(a, dim=None):
+    """
+    Find the minimum and maximum values of all the elements along a specified dimension.
+
+    Parameters
+    ----------
+    a  : af.Array
+         Multi dimensional arrayfire array.
+    dim: optional: int. default: None
+         Dimension along which the minimum and maximum values are required.
+
+    Returns
+    -------
+    (mn, mx): tuple of af.Array or scalar numbers
+         The minimum and maximum values of all elements in `a` along dimension `dim`.
+         If `dim` is `None`, the minimum and maximum values of the entire Array are returned
+         as scalars, with a single copy to the host.
+
+    Note
+    ----
+    When `dim` is not `None`, the results stay on the device and no host synchronization happens.
+    """
+    if dim is not None:
+        return (_parallel_dim(a, dim, backend.get().af_min),
+                _parallel_dim(a, dim, backend.get().af_max))
+
+    from .data import flat, join
+    vals = flat(a)
+    res = join(0, _parallel_dim(vals, 0, backend.get().af_min),
+               _parallel_dim(vals, 0, backend.get().af_max)).to_list()
+    return res[0], res[1]
+
 def all_true(a, dim=None):
     """
     Check if all the elements along a specified dimension are true.
@@ -406,6 +438,411 @@ def sort_by_key(iv, ik, dim=0, is_ascending=True):
                                            iv.arr, ik.arr, ct.c_uint(dim), ct.c_bool(is_ascending)))
     return ov,ok
 
+def _scan_dim0(a, op, seg=None, span=None):
+    # Inclusive scan of the 2 dimensional array `a` along the first dimension
+    # using log2(n) doubling steps. If `seg` is given, the scan restarts
+    # wherever the segment id changes. If `span` is given, no segment is longer
+    # than `span` and log2(span) steps are enough.
+    from .arith import maxof, minof
+    from .data import constant, join
+    from .data import range as af_range
+
+    n, m = dim4_to_tuple(a.dims())[0:2]
+    if op == 'add' and seg is None:
+        return accum(a, 0)
+
+    binop = {'add' : lambda x, y: x + y,
+             'mul' : lambda x, y: x * y,
+             'min' : minof,
+             'max' : maxof}[op]
+
+    # min and max are idempotent, so positions outside the reach of a step can
+    # combine with themselves. Sums and products combine with an identity row.
+    idempotent = op in ('min', 'max')
+    fallback = None if idempotent else n
+
+    limit = n if span is None or span > n else span
+    pos = af_range(n, dtype=Dtype.s32)
+    step = 1
+    while step < limit:
+        src = maxof(pos - step, 0)
+        valid = pos >= step
+        if seg is not None:
+            valid = valid & (seg[src] == seg)
+        if idempotent:
+            src = src * valid + pos * (1 - valid)
+            a = binop(a, a[src, :])
+        else:
+            src = src * valid + fallback * (1 - valid)
+            ident = constant(0 if op == 'add' else 1, 1, m, dtype=a.dtype())
+            a = binop(a, join(0, a, ident)[src, :])
+        step *= 2
+    return a
+
+def _scan_identity(op, dtype):
+    # The identity element of `op` for the type `dtype`.
+    if op in ('add', 'or'):
+        return 0
+    if op in ('mul', 'and'):
+        return 1
+
+    limits = {Dtype.u8.value  : (0, 255),
+              Dtype.s32.value : (-2**31, 2**31 - 1),
+              Dtype.u32.value : (0, 2**32 - 1),
+              Dtype.s64.value : (-2**63, 2**63 - 1),
+              Dtype.u64.value : (0, 2**64 - 1)}
+    lo, hi = limits.get(dtype.value, (-float('inf'), float('inf')))
+    return hi if op == 'min' else lo
+
+def scan(a, dim=0, op='add', inclusive=True):
+    """
+    Generalized prefix scan of an array along a specified dimension.
+
+    Parameters
+    ----------
+    a  : af.Array
+         Multi dimensional arrayfire array.
+    dim: optional: int. default: 0
+         Dimension along which the scan is performed.
+    op: optional: str. default: 'add'
+         The scan operator.
+         - 'add', 'mul': cumulative sum or product.
+         - 'min', 'max': cumulative minimum or maximum.
+         - 'and', 'or': cumulative logical and / or. The output is of type b8.
+    inclusive: optional: bool. default: True
+         If True, element `i` of the output includes `a[i]`.
+         If False, element `i` combines the elements before `i`, and the first
+         element is the identity of `op`.
+
+    Returns
+    -------
+    out: af.Array
+         array of same size as `a` containing the scan along `dim`.
+
+    Note
+    -------
+    `scan(a, dim)` is the same as `accum(a, dim)`. The other operators use log2(n)
+    element wise passes along `dim`.
+    """
+    from .arith import cast
+    from .data import constant, join, moddims, reorder
+
+    if op not in ('add', 'mul', 'min', 'max', 'and', 'or'):
+        raise ValueError("Unsupported scan operator: %s" % op)
+
+    order = [0, 1, 2, 3]
+    order[0], order[dim] = dim, 0
+    if dim != 0:
+        a = reorder(a, *order)
+
+    rdims = dim4_to_tuple(a.dims())
+    n = rdims[0]
+    a = moddims(a, n, rdims[1] * rdims[2] * rdims[3])
+
+    is_logical = op in ('and', 'or')
+    if is_logical:
+        # With 0 / 1 values, and is the minimum and or is the maximum.
+        a = cast(a != 0, Dtype.s32)
+    elif a.dtype() == Dtype.b8:
+        a = cast(a, Dtype.u32)
+
+    out = _scan_dim0(a, {'and' : 'min', 'or' : 'max'}.get(op, op))
+
+    if not inclusive:
+        m = dim4_to_tuple(out.dims())[1]
+        ident = constant(_scan_identity(op, out.dtype()), 1, m, dtype=out.dtype())
+        out = ident if n == 1 else join(0, ident, out[0:n-1, :])
+
+    if is_logical:
+        out = out != 0
+
+    out = moddims(out, rdims[0], rdims[1], rdims[2], rdims[3])
+    if dim != 0:
+        out = reorder(out, *order)
+    return out
+
+def _key_segments(keys):
+    # Segment ids and the first and last position of each run of equal keys.
+    from .data import constant, join
+
+    n = keys.elements()
+    if n == 0:
+        return Array(), Array(), Array()
+    if n == 1:
+        first = constant(0, 1, dtype=Dtype.u32)
+        return constant(1, 1, dtype=Dtype.u32), first, first
+
+    change = keys[1:n] != keys[0:n-1]
+    one = constant(1, 1, dtype=Dtype.b8)
+    heads = join(0, one, change)
+    tails = join(0, change, one)
+    return accum(heads), where(heads), where(tails)
+
+def _by_key(keys, values, op, is_sorted):
+    from .arith import cast
+    from .data import flat, moddims
+
+    keys = flat(keys)
+    if keys.elements() == 0:
+        return keys, values
+
+    dims = dim4_to_tuple(values.dims())
+    values = moddims(values, dims[0], dims[1] * dims[2] * dims[3])
+    if not is_sorted:
+        from .data import range as af_range
+        keys, perm = sort_by_key(keys, af_range(dims[0], dtype=Dtype.u32))
+        values = values[perm, :]
+    if values.dtype() == Dtype.b8:
+        values = cast(values, Dtype.u32)
+
+    seg, first, last = _key_segments(keys)
+    out = _scan_dim0(values, op, seg)[last, :]
+    return keys[first], moddims(out, last.elements(), dims[1], dims[2], dims[3])
+
+def sum_by_key(keys, values, is_sorted=False):
+    """
+    Calculate the sum of the values sharing the same key.
+
+    Parameters
+    ----------
+    keys  : af.Array
+         A 1 dimensional arrayfire array containing the keys.
+    values: af.Array
+         An arrayfire array with the same length as `keys` along the first dimension.
+         Every column is reduced independently.
+    is_sorted: optional: bool. default: False
+         Specifies if the keys are already sorted. If True, each run of equal
+         consecutive keys is reduced separately.
+
+    Returns
+    -------
+    (keys, out): tuple of af.Array
+         `keys` contains the unique keys in sorted order.
+         `out` contains the sum of the values of each key.
+
+    Note
+    -------
+    If `is_sorted` is False, the keys and values are sorted using `sort_by_key` first.
+    """
+    return _by_key(keys, values, 'add', is_sorted)
+
+def min_by_key(keys, values, is_sorted=False):
+    """
+    Find the minimum of the values sharing the same key.
+
+    Parameters
+    ----------
+    keys  : af.Array
+         A 1 dimensional arrayfire array containing the keys.
+    values: af.Array
+         An arrayfire array with the same length as `keys` along the first dimension.
+         Every column is reduced independently.
+    is_sorted: optional: bool. default: False
+         Specifies if the keys are already sorted. If True, each run of equal
+         consecutive keys is reduced separately.
+
+    Returns
+    -------
+    (keys, out): tuple of af.Array
+         `keys` contains the unique keys in sorted order.
+         `out` contains the minimum of the values of each key.
+    """
+    return _by_key(keys, values, 'min', is_sorted)
+
+def max_by_key(keys, values, is_sorted=False):
+    """
+    Find the maximum of the values sharing the same key.
+
+    Parameters
+    ----------
+    keys  : af.Array
+         A 1 dimensional arrayfire array containing the keys.
+    values: af.Array
+         An arrayfire array with the same length as `keys` along the first dimension.
+         Every column is reduced independently.
+    is_sorted: optional: bool. default: False
+         Specifies if the keys are already sorted. If True, each run of equal
+         consecutive keys is reduced separately.
+
+    Returns
+    -------
+    (keys, out): tuple of af.Array
+         `keys` contains the unique keys in sorted order.
+         `out` contains the maximum of the values of each key.
+    """
+    return _by_key(keys, values, 'max', is_sorted)
+
+def count_by_key(keys, is_sorted=False):
+    """
+    Count the number of occurrences of each key.
+
+    Parameters
+    ----------
+    keys  : af.Array
+         A 1 dimensional arrayfire array containing the keys.
+    is_sorted: optional: bool. default: False
+         Specifies if the keys are already sorted. If True, each run of equal
+         consecutive keys is counted separately.
+
+    Returns
+    -------
+    (keys, out): tuple of af.Array
+         `keys` contains the unique keys in sorted order.
+         `out` contains the number of occurrences of each key.
+    """
+    from .data import flat
+
+    keys = flat(keys)
+    if keys.elements() == 0:
+        return keys, Array()
+    if not is_sorted:
+        keys = sort(keys)
+    first, last = _key_segments(keys)[1:3]
+    return keys[first], last - first + 1
+
+def scan_by_key(keys, values, op='add'):
+    """
+    Inclusive scan of the values restarting at every change of key.
+
+    Parameters
+    ----------
+    keys  : af.Array
+         A 1 dimensional arrayfire array containing the keys.
+    values: af.Array
+         An arrayfire array with the same length as `keys` along the first dimension.
+         Every column is scanned independently.
+    op: optional: str. default: 'add'
+         The scan operator. One of 'add', 'mul', 'min' or 'max'.
+
+    Returns
+    -------
+    out: af.Array
+         An array of the same size as `values`, where each run of equal consecutive
+         keys is scanned separately.
+
+    Note
+    -------
+    The keys are not sorted. Use `sort_by_key` first to scan all the values of a key together.
+    """
+    from .arith import cast
+    from .data import flat, moddims
+
+    if op not in ('add', 'mul', 'min', 'max'):
+        raise ValueError("Unsupported scan operator: %s" % op)
+
+    if keys.elements() == 0:
+        return values
+
+    dims = dim4_to_tuple(values.dims())
+    values = moddims(values, dims[0], dims[1] * dims[2] * dims[3])
+    if values.dtype() == Dtype.b8:
+        values = cast(values, Dtype.u32)
+
+    seg = _key_segments(flat(keys))[0]
+    return moddims(_scan_dim0(values, op, seg), dims[0], dims[1], dims[2], dims[3])
+
+def _topk_dim0(a, k, largest):
+    # Select the top k values of each column of the 2 dimensional array `a`.
+    # A histogram of each column finds a threshold bin holding the k-th value,
+    # and only the candidates above that threshold are sorted.
+    from .arith import cast, floor, maxof, minof
+    from .data import flat, flip, moddims, tile
+    from .data import range as af_range
+    from .image import histogram
+
+    n, num = dim4_to_tuple(a.dims())[0:2]
+    # Aim for about k / 4 values in the threshold bin.
+    nbins = 4 * (n // k)
+    nbins = 4096 if nbins > 4096 else nbins
+    nbins = n if nbins > n else nbins
+    nbins = 1 if nbins < 1 else nbins
+
+    mn, mx = minmax(a, 0)
+    vals = cast(a, Dtype.f64) if a.dtype() == Dtype.f64 else cast(a, Dtype.f32)
+    span = cast(mx, vals.dtype()) - cast(mn, vals.dtype())
+    span = span + (span == 0)
+    scale = tile(float(nbins) / span, n)
+    bins = cast(floor((vals - tile(cast(mn, vals.dtype()), n)) * scale), Dtype.s32)
+    bins = minof(maxof(bins, 0), nbins - 1)
+    if not largest:
+        bins = (nbins - 1) - bins
+
+    cols = af_range(n, num, dim=1, dtype=Dtype.s32)
+    counts = histogram(flat(bins + cols * nbins), nbins * num, 0, nbins * num)
+    counts = moddims(counts, nbins, num)
+
+    # Number of values in each bin or above, the threshold is the last bin
+    # where at least k values remain.
+    above = flip(accum(flip(counts, 0), 0), 0)
+    thresh = cast(count(above >= k, 0), Dtype.s32) - 1
+
+    idx = where(flat(bins >= tile(thresh, n)))
+    cand = flat(a)[idx]
+
+    # Order the candidates by value, then group them by column. The grouping
+    # sorts on (column, position in the value order), so it does not depend
+    # on the sort keeping equal keys in order.
+    cand, idx = sort_by_key(cand, idx, is_ascending=not largest)
+    m = idx.elements()
+    order = sort(cast(idx / n, Dtype.s64) * m + af_range(m, dtype=Dtype.s64))
+    col = cast(order / m, Dtype.s32)
+    pos = order % m
+    idx = idx[pos]
+    cand = cand[pos]
+
+    per_col = cast(histogram(col, num, 0, num), Dtype.s32)
+    start = accum(per_col) - per_col
+    sel = flat(af_range(k, num, dtype=Dtype.s32) + tile(moddims(start, 1, num), k))
+    return moddims(cand[sel], k, num), moddims(cast(idx[sel] % n, Dtype.u32), k, num)
+
+def topk(a, k, dim=0, largest=True):
+    """
+    Find the k largest or smallest values along a specified dimension.
+
+    Parameters
+    ----------
+    a  : af.Array
+         Multi dimensional arrayfire array.
+    k  : int
+         Number of values to select. Needs to be less than or equal to the length of `dim`.
+    dim: optional: int. default: 0
+         Dimension along which the values are selected.
+    largest: optional: bool. default: True
+         Selects the largest values if True, else the smallest values.
+
+    Returns
+    -------
+    (val, idx): tuple of af.Array
+         `val` contains the selected values in sorted order, with length `k` along `dim`.
+         `idx` contains the indices of `val` along `dim` in `a`.
+
+    Note
+    -------
+    The values are selected without sorting `a`. A histogram of each slice along `dim` finds
+    a threshold, and only the values above it are sorted. This is much faster than `sort_index`
+    when `k` is small compared to the length of `dim`.
+    """
+    from .data import moddims, reorder
+
+    dims = dim4_to_tuple(a.dims())
+    if k < 1 or k > dims[dim]:
+        raise ValueError("k needs to be between 1 and %d" % dims[dim])
+
+    order = [0, 1, 2, 3]
+    order[0], order[dim] = dim, 0
+    if dim != 0:
+        a = reorder(a, *order)
+
+    rdims = dim4_to_tuple(a.dims())
+    val, idx = _topk_dim0(moddims(a, rdims[0], rdims[1] * rdims[2] * rdims[3]), k, largest)
+    val = moddims(val, k, rdims[1], rdims[2], rdims[3])
+    idx = moddims(idx, k, rdims[1], rdims[2], rdims[3])
+
+    if dim != 0:
+        val = reorder(val, *order)
+        idx = reorder(idx, *order)
+    return val, idx
+
 def set_unique(a, is_sorted=False):
     """
     Find the unique elements of an array.
@@ -426,6 +863,68 @@ def set_unique(a, is_sorted=False):
     safe_call(backend.get().af_set_unique(ct.pointer(out.arr), a.arr, ct.c_bool(is_sorted)))
     return out
 
+def unique(a, return_index=False, return_inverse=False, return_counts=False, is_sorted=False):
+    """
+    Find the unique elements of an array along with their positions and counts.
+
+    Parameters
+    ----------
+    a  : af.Array
+         Multi dimensional arrayfire array. It is flattened in column major order.
+    return_index: optional: bool. default: False
+         If True, also return the position of the first occurrence of each unique value.
+    return_inverse: optional: bool. default: False
+         If True, also return the position of each element of `a` in the unique values.
+    return_counts: optional: bool. default: False
+         If True, also return the number of occurrences of each unique value.
+    is_sorted: optional: bool. default: False
+         Specifies if the input is pre-sorted.
+
+    Returns
+    -------
+    out: af.Array or tuple of af.Array
+         - `values` containing the unique values of `a` in sorted order.
+         - `index` of type u32 such that `flat(a)[index] == values`, if `return_index` is True.
+         - `inverse` of type u32 such that `values[inverse] == flat(a)`, if `return_inverse` is True.
+         - `counts` containing the number of occurrences of each value, if `return_counts` is True.
+         If only `values` is requested, it is returned as an af.Array.
+
+    Note
+    -------
+    All the outputs come from a single sort of `a` followed by a comparison of
+    neighbouring elements.
+    """
+    from .arith import cast
+    from .data import constant, flat
+    from .data import range as af_range
+
+    a = flat(a)
+    n = a.elements()
+    perm = None
+    if not is_sorted:
+        # The first position of each run is the first occurrence of the value,
+        # since sort_by_key keeps equal keys in their input order.
+        a, perm = sort_by_key(a, af_range(n, dtype=Dtype.u32))
+
+    seg, first, last = _key_segments(a)
+    out = [a[first]]
+
+    if return_index:
+        out.append(first if perm is None else perm[first])
+
+    if return_inverse:
+        inverse = cast(seg - 1, Dtype.u32)
+        if perm is not None:
+            scattered = constant(0, n, dtype=Dtype.u32)
+            scattered[perm] = inverse
+            inverse = scattered
+        out.append(inverse)
+
+    if return_counts:
+        out.append(last - first + 1)
+
+    return out[0] if len(out) == 1 else tuple(out)
+
 def set_union(a, b, is_unique=False):
     """
     Find the union of two arrays.
@@ -444,6 +943,11 @@ def set_union(a, b, is_unique=False):
     out: af.Array
          an array values after performing the union of `a` and `b`.
     """
+    if not is_unique:
+        # A single sort of both inputs instead of sorting each of them first.
+        from .data import flat, join
+        return unique(join(0, flat(a), flat(b)))
+
     out = Array()
     safe_call(backend.get().af_set_union(ct.pointer(out.arr), a.arr, b.arr, ct.c_bool(is_unique)))
     return out
@@ -466,6 +970,25 @@ def set_intersect(a, b, is_unique=False):
     out: af.Array
          an array values after performing the intersect of `a` and `b`.
     """
+    if not is_unique:
+        # Sort both inputs together, tagging the elements coming from `b`.
+        # A value is in both arrays if its run contains tagged and untagged elements.
+        from .data import constant, flat, join
+
+        a = flat(a)
+        b = flat(b)
+        tags = join(0, constant(0, a.elements(), dtype=Dtype.u32),
+                    constant(1, b.elements(), dtype=Dtype.u32))
+        keys, tags = sort_by_key(join(0, a, b), tags)
+
+        first, last = _key_segments(keys)[1:3]
+        csum = accum(tags)
+        nb = csum[last] - csum[first] + tags[first]
+        idx = where((nb > 0) & (nb < last - first + 1))
+        if idx.elements() == 0:
+            return Array()
+        return keys[first[idx]]
+
     out = Array()
     safe_call(backend.get().af_set_intersect(ct.pointer(out.arr), a.arr, b.arr, ct.c_bool(is_unique)))
     return out
@@ -15,6 +15,7 @@ from .library import *
 from .array import *
 from .data import constant
 import os
+import sys
 
 def gradient(image):
     """
@@ -38,13 +39,19 @@ def gradient(image):
     safe_call(backend.get().af_gradient(ct.pointer(dx.arr), ct.pointer(dy.arr), image.arr))
     return dx, dy
 
+def _encode_path(file_name):
+    # Paths are passed to the C library as bytes in the file system encoding.
+    if isinstance(file_name, bytes):
+        return file_name
+    return file_name.encode(sys.getfilesystemencoding() or 'utf-8')
+
 def load_image(file_name, is_color=False):
     """
     Load an image on the disk as an array.
 
     Parameters
     ----------
-    file_name: str
+    file_name: str or bytes
           - Full path of the file name on disk.
 
     is_color : optional: bool. default: False.
@@ -56,10 +63,11 @@ def load_image(file_name, is_color=False):
             A 2 dimensional (1 channel) or 3 dimensional (3 channel) array containing the image.
 
     """
-    assert(os.path.isfile(file_name))
+    if not os.path.isfile(file_name):
+        raise IOError("No such file: %s" % file_name)
     image = Array()
     safe_call(backend.get().af_load_image(ct.pointer(image.arr),
-                                          ct.c_char_p(file_name.encode('ascii')), is_color))
+                                          ct.c_char_p(_encode_path(file_name)), is_color))
     return image
 
 def save_image(image, file_name):
@@ -71,13 +79,205 @@ def save_image(image, file_name):
     image : af.Array
           - A 2 D arrayfire array representing an image.
 
-    file_name: str
+    file_name: str or bytes
           - Full path of the file name on the disk.
     """
-    assert(isinstance(file_name, str))
-    safe_call(backend.get().af_save_image(ct.c_char_p(file_name.encode('ascii')), image.arr))
+    dir_name = os.path.dirname(file_name)
+    if dir_name and not os.path.isdir(dir_name):
+        raise IOError("No such directory: %s" % dir_name)
+    safe_call(backend.get().af_save_image(ct.c_char_p(_encode_path(file_name)), image.arr))
     return image
 
+def _load_on_device(args):
+    file_name, is_color, device = args
+    # The active device is per thread, use the device of the calling thread.
+    from .device import set_device
+    set_device(device)
+    return load_image(file_name, is_color)
+
+def _stack_images(images, paths, is_color):
+    if len(images) == 1:
+        return images[0]
+
+    d0, d1, d2, d3 = dim4_to_tuple(images[0].dims())
+    for image, file_name in zip(images, paths):
+        if dim4_to_tuple(image.dims()) != (d0, d1, d2, d3):
+            raise ValueError("Size of %s is %s, expected %s" %
+                             (file_name, image.dims(), images[0].dims()))
+
+    num = len(images)
+    if is_color:
+        out = constant(0, d0, d1, d2, num, dtype=images[0].dtype())
+        for i, image in enumerate(images):
+            out[:, :, :, i] = image
+    else:
+        out = constant(0, d0, d1, num, dtype=images[0].dtype())
+        for i, image in enumerate(images):
+            out[:, :, i] = image
+    return out
+
+def _iter_image_batches(paths, is_color, device, workers, batch_size, prefetch):
+    # The pool is created on the first next() and released when the
+    # generator is exhausted, closed or garbage collected.
+    from collections import deque
+    from multiprocessing.pool import ThreadPool
+
+    pool = ThreadPool(workers)
+    try:
+        pending = deque()
+        for begin in range(0, len(paths), batch_size):
+            batch = paths[begin:begin + batch_size]
+            args = [(file_name, is_color, device) for file_name in batch]
+            pending.append((batch, pool.map_async(_load_on_device, args)))
+            # Keep `prefetch` batches decoding while the caller processes this one.
+            if len(pending) <= prefetch:
+                continue
+            batch, result = pending.popleft()
+            yield _stack_images(result.get(), batch, is_color)
+
+        while len(pending) > 0:
+            batch, result = pending.popleft()
+            yield _stack_images(result.get(), batch, is_color)
+    finally:
+        pool.terminate()
+        pool.join()
+
+def load_images(paths, is_color=False, workers=4, batch_size=None, prefetch=2):
+    """
+    Load multiple images on the disk as a single batched array.
+
+    Parameters
+    ----------
+    paths: list of str
+          - Full paths of the files on disk. All the images need to be of the same size.
+
+    is_color : optional: bool. default: False.
+          - Specifies if the images are loaded as 1 channel (if False) or 3 channel images (if True).
+
+    workers : optional: int. default: 4.
+          - Number of threads used to decode the images.
+
+    batch_size : optional: int. default: None.
+          - If None, all the images are loaded and returned as a single array.
+          - Otherwise an iterator is returned that yields batches of `batch_size` images.
+
+    prefetch : optional: int. default: 2.
+          - Number of batches decoded ahead of the one being consumed.
+          - Only used when `batch_size` is not None.
+
+    Returns
+    -------
+    images - af.Array or iterator of af.Array
+           - A 3 dimensional array of size [d0 d1 N] when `is_color` is False.
+           - A 4 dimensional array of size [d0 d1 3 N] when `is_color` is True.
+
+    Note
+    ----
+    - The images are decoded in parallel on a thread pool. The GIL is released while decoding.
+    - In the iterator mode at most `batch_size * (prefetch + 1)` images are held in memory,
+      and decoding the next batches overlaps with processing the current one.
+
+    """
+    from multiprocessing.pool import ThreadPool
+    from .device import get_device
+
+    paths = list(paths)
+    if len(paths) == 0:
+        raise ValueError("No image paths given")
+    for file_name in paths:
+        if not os.path.isfile(file_name):
+            raise IOError("No such file: %s" % file_name)
+
+    device = get_device()
+    if batch_size is not None:
+        return _iter_image_batches(paths, is_color, device, max(1, workers),
+                                   max(1, batch_size), max(0, prefetch))
+
+    pool = ThreadPool(max(1, workers))
+    try:
+        images = pool.map(_load_on_device, [(file_name, is_color, device) for file_name in paths])
+    finally:
+        pool.terminate()
+        pool.join()
+    return _stack_images(images, paths, is_color)
+
+def _save_on_device(args):
+    image, file_name, device = args
+    from .device import set_device
+    set_device(device)
+    save_image(image, file_name)
+
+def save_images(images, pattern, is_color=False, workers=4, max_pending=None):
+    """
+    Save a batch of images to the disk.
+
+    Parameters
+    ----------
+    images : af.Array
+          - A 3 or 4 dimensional array of size [d0 d1 N] or [d0 d1 N M] if `is_color` is False.
+          - A 4 dimensional array of size [d0 d1 3 N] if `is_color` is True.
+
+    pattern : str
+          - File name pattern containing a format specifier for the image index. eg: "out_%05d.png"
+
+    is_color : optional: bool. default: False.
+          - Specifies if dimension 2 of `images` holds the color channels.
+
+    workers : optional: int. default: 4.
+          - Number of threads used to encode the images.
+
+    max_pending : optional: int. default: None.
+          - Maximum number of images sliced from the batch but not yet written.
+          - If None, it is set to `2 * workers`.
+
+    Returns
+    -------
+    info : dict
+         - 'images': Number of images written.
+         - 'seconds': Time taken to write the images.
+         - 'images_per_sec': Throughput.
+
+    Note
+    ----
+    - Image `i` is written to `pattern % i`. For 4 dimensional gray scale batches `i = k + l * N`
+      for the image at `[:, :, k, l]`.
+    - Only `max_pending` slices of the batch are kept alive at any time.
+
+    """
+    from multiprocessing.pool import ThreadPool
+    from collections import deque
+    from time import time
+    from .device import get_device
+
+    dims = dim4_to_tuple(images.dims())
+    num = dims[3] if is_color else dims[2] * dims[3]
+    if max_pending is None:
+        max_pending = 2 * workers
+
+    device = get_device()
+    pool = ThreadPool(max(1, workers))
+    pending = deque()
+    start = time()
+    try:
+        for i in range(num):
+            if is_color:
+                image = images[:, :, :, i]
+            else:
+                image = images[:, :, i % dims[2], i // dims[2]]
+            pending.append(pool.apply_async(_save_on_device, ((image, pattern % i, device),)))
+            if len(pending) >= max(1, max_pending):
+                pending.popleft().get()
+
+        while len(pending) > 0:
+            pending.popleft().get()
+    finally:
+        pool.terminate()
+        pool.join()
+
+    seconds = time() - start
+    return {'images' : num, 'seconds' : seconds,
+            'images_per_sec' : num / seconds if seconds > 0 else float('inf')}
+
 def resize(image, scale=None, odim0=None, odim1=None, method=INTERP.NEAREST):
     """
     Resize an image.
@@ -127,6 +327,129 @@ def resize(image, scale=None, odim0=None, odim1=None, method=INTERP.NEAREST):
 
     return output
 
+def _gaussian_kernel1(sigma):
+    # A normalized 1 D gaussian kernel with a radius of 3 sigma, built on the host.
+    import math
+    radius = max(1, int(math.ceil(3 * sigma)))
+    vals = [math.exp(-0.5 * (k * k) / (sigma * sigma)) for k in range(-radius, radius + 1)]
+    total = sum(vals)
+    return Array([v / total for v in vals])
+
+class Pyramid(object):
+    """
+    A gaussian and laplacian image pyramid with cached levels.
+
+    Parameters
+    ----------
+    image : af.Array
+          - A 2 D arrayfire array representing an image, or
+          - A multi dimensional array representing batch of images.
+
+    levels : optional: int. default: 4.
+          - The maximum number of levels including the input image.
+          - Fewer levels are built if a level would be smaller than 1 pixel.
+
+    scale : optional: scalar. default: 0.5.
+          - The ratio of the size of each level to the size of the previous level.
+
+    method : optional: af.INTERP. default: af.INTERP.BILINEAR.
+          - Interpolation method used when resizing.
+
+    sigma : optional: scalar. default: None.
+          - The standard deviation of the gaussian used to smooth each level before resizing.
+          - If None, `0.5 / scale` is used.
+
+    Note
+    ----
+    - Levels are computed the first time they are requested and cached.
+    - Each level is computed for the whole batch with one separable convolution and one resize.
+
+    Examples
+    --------
+
+    >>> import arrayfire as af
+    >>> pyr = af.Pyramid(af.randu(64, 64, 8), levels=3)
+    >>> af.display(pyr.gaussian(2))
+    >>> af.display(pyr.laplacian(0))
+
+    """
+
+    def __init__(self, image, levels = 4, scale = 0.5, method = INTERP.BILINEAR, sigma = None):
+        if not (0 < scale < 1):
+            raise ValueError("scale needs to be between 0 and 1")
+
+        dims = dim4_to_tuple(image.dims())
+        num = 1
+        d0, d1 = dims[0], dims[1]
+        while num < levels:
+            d0, d1 = int(d0 * scale), int(d1 * scale)
+            if d0 < 1 or d1 < 1:
+                break
+            num += 1
+
+        self.levels = num
+        self.scale = scale
+        self.method = method
+        self.sigma = 0.5 / scale if sigma is None else sigma
+        self._kernel = None
+        self._gaussian = [image]
+        self._laplacian = [None] * num
+
+    def _check_level(self, level):
+        if level < 0 or level >= self.levels:
+            raise IndexError("Pyramid level %d out of range [0, %d)" % (level, self.levels))
+
+    def _resize_like(self, image, level):
+        dims = self._gaussian[level].dims()
+        return resize(image, odim0=dims[0], odim1=dims[1], method=self.method)
+
+    def gaussian(self, level):
+        """
+        Return the gaussian pyramid level `level`. Level 0 is the input image.
+        """
+        self._check_level(level)
+        while len(self._gaussian) <= level:
+            from .signal import convolve2_separable
+            if self._kernel is None:
+                self._kernel = _gaussian_kernel1(self.sigma)
+            prev = self._gaussian[-1]
+            dims = prev.dims()
+            blurred = convolve2_separable(prev, self._kernel, self._kernel)
+            self._gaussian.append(resize(blurred, odim0=int(dims[0] * self.scale),
+                                         odim1=int(dims[1] * self.scale), method=self.method))
+        return self._gaussian[level]
+
+    def laplacian(self, level):
+        """
+        Return the laplacian pyramid level `level`.
+
+        The last level is the same as the last gaussian level.
+        """
+        self._check_level(level)
+        if self._laplacian[level] is None:
+            if level == self.levels - 1:
+                self._laplacian[level] = self.gaussian(level)
+            else:
+                coarse = self._resize_like(self.gaussian(level + 1), level)
+                self._laplacian[level] = self.gaussian(level) - coarse
+        return self._laplacian[level]
+
+    def collapse(self, level = 0):
+        """
+        Reconstruct gaussian level `level` from the laplacian levels.
+        """
+        self._check_level(level)
+        out = self.laplacian(self.levels - 1)
+        for k in reversed(range(level, self.levels - 1)):
+            out = self._resize_like(out, k) + self.laplacian(k)
+        return out
+
+    def __len__(self):
+        return self.levels
+
+    def __getitem__(self, level):
+        return self.gaussian(level)
+
 def transform(image, trans_mat, odim0 = 0, odim1 = 0, method=INTERP.NEAREST, is_inverse=True):
     """
     Transform an image using a transformation matrix.
@@ -345,26 +668,32 @@ def histogram(image, nbins, min_val = None, max_val = None):
 
     min_val : optional: scalar. default: None.
           - The lower bound for the bin values.
-          - If None, `af.min(image)` is used.
+          - If None, the minimum of each image is used.
 
     max_val : optional: scalar. default: None.
           - The upper bound for the bin values.
-          - If None, `af.max(image)` is used.
+          - If None, the maximum of each image is used.
 
     Returns
     ---------
     hist : af.Array
           - Containing the histogram of the image.
+          - For a batch of images, one histogram per image.
 
-    """
-    from .algorithm import min as af_min
-    from .algorithm import max as af_max
+    Note
+    ----
+    When both bounds are None, they are computed with `af.minmax` and kept on the device.
+    Each image of a batch is binned using its own bounds.
 
-    if min_val is None:
-        min_val = af_min(image)
+    """
+    if min_val is None and max_val is None:
+        return _histogram_own_bounds(image, nbins)
 
-    if max_val is None:
-        max_val = af_max(image)
+    if min_val is None or max_val is None:
+        from .algorithm import minmax
+        mn, mx = minmax(image)
+        min_val = mn if min_val is None else min_val
+        max_val = mx if max_val is None else max_val
 
     output = Array()
     safe_call(backend.get().af_histogram(ct.pointer(output.arr),
@@ -372,6 +701,38 @@ def histogram(image, nbins, min_val = None, max_val = None):
                                          ct.c_double(min_val), ct.c_double(max_val)))
     return output
 
+def _histogram_own_bounds(image, nbins):
+    # Bin each image using its own bounds on the device, without a host sync.
+    # The bin of a value is floor((v - min) * (nbins / (max - min))), the same
+    # expression as the native histogram, so integer images whose span equals
+    # nbins bin exactly. Bins of image k are offset by k * nbins and all the
+    # images are counted with one histogram of integer bins.
+    from .algorithm import minmax
+    from .arith import cast, floor, maxof, minof
+    from .bcast import broadcast
+    from .data import flat, moddims
+    from .data import range as af_range
+
+    d0, d1, d2, d3 = dim4_to_tuple(image.dims())
+    if image.dtype() != Dtype.f64:
+        image = cast(image, Dtype.f32)
+
+    mn, mx = minmax(moddims(image, d0 * d1, d2, d3), 0)
+    mn = moddims(mn, 1, 1, d2, d3)
+    span = moddims(mx, 1, 1, d2, d3) - mn
+    step = nbins / (span + (span == 0))
+
+    idx = broadcast(lambda x, lo, s: floor((x - lo) * s), image, mn, step)
+    idx = minof(maxof(cast(idx, Dtype.s32), 0), nbins - 1)
+
+    nimages = d2 * d3
+    if nimages > 1:
+        offset = moddims(af_range(nimages, dtype=Dtype.s32) * nbins, 1, 1, d2, d3)
+        idx = broadcast(lambda x, o: x + o, idx, offset)
+
+    total = nbins * nimages
+    return moddims(histogram(cast(flat(idx), Dtype.s32), total, 0, total), nbins, 1, d2, d3)
+
 def hist_equal(image, hist):
     """
     Equalize an image based on a histogram.
@@ -396,6 +757,71 @@ def hist_equal(image, hist):
     safe_call(backend.get().af_hist_equal(ct.pointer(output.arr), image.arr, hist.arr))
     return output
 
+_morph_min_elements = 25
+
+def _running_extreme(a, w, op, value):
+    # Van Herk / Gil-Werman running min or max over windows of length `w`
+    # along the first dimension. The padded signal is split into blocks of
+    # length `w`, and each window is covered by the suffix of one block and
+    # the prefix of the next.
+    from .data import join, moddims
+
+    if w == 1:
+        return a
+
+    d0, d1, d2, d3 = dim4_to_tuple(a.dims())
+    nblk = (d0 + w - 1 + w - 1) // w
+    before = w // 2
+    padded = _pad(a, 0, before, nblk * w - d0 - before, value)
+    padded = moddims(padded, w, nblk, d1, d2 * d3)
+
+    # Block prefix and suffix scans. There is no min / max scan, so they are
+    # computed with log2(w) doubling steps.
+    g = padded
+    h = padded
+    s = 1
+    while s < w:
+        g = op(g, join(0, g[0:s], g[0:w-s]))
+        h = op(h, join(0, h[s:w], h[w-s:w]))
+        s *= 2
+
+    g = moddims(g, nblk * w, d1, d2, d3)
+    h = moddims(h, nblk * w, d1, d2, d3)
+    return op(h[0:d0], g[w-1:w-1+d0])
+
+def _separable_extreme(a, sizes, op, value):
+    from .data import reorder
+
+    for dim, w in enumerate(sizes):
+        if w == 1:
+            continue
+        if dim == 0:
+            a = _running_extreme(a, w, op, value)
+        else:
+            # Swap `dim` with the first dimension and back.
+            order = [0, 1, 2, 3]
+            order[0], order[dim] = dim, 0
+            a = reorder(a, *order)
+            a = _running_extreme(a, w, op, value)
+            a = reorder(a, *order)
+    return a
+
+def _rect_mask_sizes(mask, rank):
+    # Return the sizes of a mask of all ones that is large enough to benefit
+    # from the separable algorithm, else None.
+    from .algorithm import all_true
+
+    sizes = dim4_to_tuple(mask.dims())
+    if any(d != 1 for d in sizes[rank:]):
+        return None
+
+    num = 1
+    for d in sizes[0:rank]:
+        num *= d
+    if num <= _morph_min_elements or not all_true(mask):
+        return None
+    return sizes[0:rank]
+
 def dilate(image, mask = None):
     """
     Run image dilate on the image.
@@ -416,10 +842,21 @@ def dilate(image, mask = None):
     output : af.Array
            - The dilated image.
 
+    Note
+    ----
+    Rectangular and line masks of all ones are applied as separable running max passes
+    (van Herk / Gil-Werman), whose cost grows with the log of the mask size instead of its area.
+    Pixels outside the image are ignored.
+
     """
     if mask is None:
         mask = constant(1, 3, 3, dtype=Dtype.f32)
 
+    sizes = _rect_mask_sizes(mask, 2)
+    if sizes is not None:
+        from .arith import maxof
+        return _separable_extreme(image, sizes, maxof, None)
+
     output = Array()
     safe_call(backend.get().af_dilate(ct.pointer(output.arr), image.arr, mask.arr))
 
@@ -445,10 +882,21 @@ def dilate3(volume, mask = None):
     output : af.Array
            - The dilated volume.
 
+    Note
+    ----
+    Rectangular and line masks of all ones are applied as separable running max passes
+    (van Herk / Gil-Werman), whose cost grows with the log of the mask size instead of its area.
+    Pixels outside the volume are ignored.
+
     """
     if mask is None:
         mask = constant(1, 3, 3, 3, dtype=Dtype.f32)
 
+    sizes = _rect_mask_sizes(mask, 3)
+    if sizes is not None:
+        from .arith import maxof
+        return _separable_extreme(volume, sizes, maxof, None)
+
     output = Array()
     safe_call(backend.get().af_dilate3(ct.pointer(output.arr), volume.arr, mask.arr))
 
@@ -474,10 +922,21 @@ def erode(image, mask = None):
     output : af.Array
            - The eroded image.
 
+    Note
+    ----
+    Rectangular and line masks of all ones are applied as separable running min passes
+    (van Herk / Gil-Werman), whose cost grows with the log of the mask size instead of its area.
+    Pixels outside the image are ignored.
+
     """
     if mask is None:
         mask = constant(1, 3, 3, dtype=Dtype.f32)
 
+    sizes = _rect_mask_sizes(mask, 2)
+    if sizes is not None:
+        from .arith import minof
+        return _separable_extreme(image, sizes, minof, None)
+
     output = Array()
     safe_call(backend.get().af_erode(ct.pointer(output.arr), image.arr, mask.arr))
 
@@ -503,16 +962,102 @@ def erode3(volume, mask = None):
     output : af.Array
            - The eroded volume.
 
+    Note
+    ----
+    Rectangular and line masks of all ones are applied as separable running min passes
+    (van Herk / Gil-Werman), whose cost grows with the log of the mask size instead of its area.
+    Pixels outside the volume are ignored.
+
     """
 
     if mask is None:
         mask = constant(1, 3, 3, 3, dtype=Dtype.f32)
 
+    sizes = _rect_mask_sizes(mask, 3)
+    if sizes is not None:
+        from .arith import minof
+        return _separable_extreme(volume, sizes, minof, None)
+
     output = Array()
     safe_call(backend.get().af_erode3(ct.pointer(output.arr), volume.arr, mask.arr))
 
     return output
 
+def opening(image, mask = None):
+    """
+    Run morphological opening (erode followed by dilate) on the image.
+
+    Parameters
+    ----------
+    image : af.Array
+          - A 2 D arrayfire array representing an image, or
+          - A multi dimensional array representing batch of images.
+
+    mask  : optional: af.Array. default: None.
+          - Specifies the neighborhood of a pixel.
+          - When None, a [3, 3] array of all ones is used.
+
+    Returns
+    ---------
+
+    output : af.Array
+           - The opened image.
+
+    """
+    return dilate(erode(image, mask), mask)
+
+def closing(image, mask = None):
+    """
+    Run morphological closing (dilate followed by erode) on the image.
+
+    Parameters
+    ----------
+    image : af.Array
+          - A 2 D arrayfire array representing an image, or
+          - A multi dimensional array representing batch of images.
+
+    mask  : optional: af.Array. default: None.
+          - Specifies the neighborhood of a pixel.
+          - When None, a [3, 3] array of all ones is used.
+
+    Returns
+    ---------
+
+    output : af.Array
+           - The closed image.
+
+    """
+    return erode(dilate(image, mask), mask)
+
+def top_hat(image, mask = None, is_black = False):
+    """
+    Run morphological top hat transform on the image.
+
+    Parameters
+    ----------
+    image : af.Array
+          - A 2 D arrayfire array representing an image, or
+          - A multi dimensional array representing batch of images.
+
+    mask  : optional: af.Array. default: None.
+          - Specifies the neighborhood of a pixel.
+          - When None, a [3, 3] array of all ones is used.
+
+    is_black : optional: bool. default: False.
+          - If False, returns `image - opening(image, mask)` (white top hat).
+          - If True, returns `closing(image, mask) - image` (black top hat).
+
+    Returns
+    ---------
+
+    output : af.Array
+           - The top hat transformed image.
+
+    """
+    if is_black:
+        return closing(image, mask) - image
+    return image - opening(image, mask)
+
 def bilateral(image, s_sigma, c_sigma, is_color = False):
     """
     Apply bilateral filter to the image.
@@ -637,7 +1182,18 @@ def minfilt(image, w_len = 3, w_wid = 3, edge_pad = PAD.ZERO):
     output : af.Array
            - The image after min filter is applied.
 
+    Note
+    ----
+    Windows larger than 25 pixels are computed with separable running min passes
+    (van Herk / Gil-Werman), whose cost grows with the log of the window size instead of its area.
+
     """
+    if w_len * w_wid > _morph_min_elements:
+        from .arith import minof
+        # Symmetric padding only repeats values already inside the window.
+        value = 0 if edge_pad == PAD.ZERO else None
+        return _separable_extreme(image, (w_len, w_wid), minof, value)
+
     output = Array()
     safe_call(backend.get().af_minfilt(ct.pointer(output.arr),
                                        image.arr, ct.c_longlong(w_len),
@@ -669,13 +1225,362 @@ def maxfilt(image, w_len = 3, w_wid = 3, edge_pad = PAD.ZERO):
     output : af.Array
            - The image after max filter is applied.
 
+    Note
+    ----
+    Windows larger than 25 pixels are computed with separable running max passes
+    (van Herk / Gil-Werman), whose cost grows with the log of the window size instead of its area.
+
     """
+    if w_len * w_wid > _morph_min_elements:
+        from .arith import maxof
+        # Symmetric padding only repeats values already inside the window.
+        value = 0 if edge_pad == PAD.ZERO else None
+        return _separable_extreme(image, (w_len, w_wid), maxof, value)
+
     output = Array()
     safe_call(backend.get().af_maxfilt(ct.pointer(output.arr),
                                        image.arr, ct.c_longlong(w_len),
                                        ct.c_longlong(w_wid), edge_pad.value))
     return output
 
+def integral_image(image):
+    """
+    Find the integral image (summed area table) of an image.
+
+    Parameters
+    ----------
+    image : af.Array
+          - A 2 D arrayfire array representing an image, or
+          - A multi dimensional array representing batch of images.
+
+    Returns
+    ---------
+
+    output : af.Array
+           - An array of the same size as `image` where `output[i, j]` is the sum of
+             `image[0:i+1, 0:j+1]`.
+
+    Note
+    ----
+    Integer images produce integer sums. Use a 64 bit type for large images to avoid overflow.
+
+    """
+    from .algorithm import accum
+    return accum(accum(image, 0), 1)
+
+def _pad(a, dim, before, after, value = 0):
+    # Pad `a` along `dim` with a constant, or by replicating the edges when
+    # `value` is None.
+    from .data import join, tile
+
+    dims = list(dim4_to_tuple(a.dims()))
+    parts = []
+    for num, edge in ((before, 0), (after, -1)):
+        if num == 0:
+            continue
+        if value is None:
+            key = [slice(None)] * 4
+            key[dim] = edge
+            reps = [1] * 4
+            reps[dim] = num
+            parts.append(tile(a[tuple(key)], reps[0], reps[1], reps[2], reps[3]))
+        else:
+            dims[dim] = num
+            parts.append(constant(value, dims[0], dims[1], dims[2], dims[3], dtype=a.dtype()))
+
+    if len(parts) == 0:
+        return a
+    elif before == 0:
+        return join(dim, a, parts[0])
+    elif after == 0:
+        return join(dim, parts[0], a)
+    return join(dim, parts[0], a, parts[1])
+
+def _window_sums(image, w0, w1, h0, h1):
+    # Sums over the [w0, w1] windows starting `h0` rows and `h1` columns
+    # before each pixel, with zero padding at the edges.
+    from .algorithm import accum
+
+    d0, d1 = dim4_to_tuple(image.dims())[0:2]
+
+    # Pad with the window and one leading zero, so each window sum is a
+    # difference of two entries of the prefix sums along each dimension.
+    padded = _pad(image, 0, h0 + 1, w0 - 1 - h0)
+    rows = accum(padded, 0)
+    rows = rows[w0:w0+d0, :] - rows[0:d0, :]
+
+    padded = _pad(rows, 1, h1 + 1, w1 - 1 - h1)
+    cols = accum(padded, 1)
+    return cols[:, w1:w1+d1] - cols[:, 0:d1]
+
+def box_filter(image, w0 = 3, w1 = 3, normalize = True):
+    """
+    Apply a box (mean) filter to the image.
+
+    Parameters
+    ----------
+    image : af.Array
+          - A 2 D arrayfire array representing an image, or
+          - A multi dimensional array representing batch of images.
+
+    w0 : optional: int. default: 3.
+          - The length of the filter along the first dimension.
+
+    w1 : optional: int. default: 3.
+          - The length of the filter along the second dimension.
+
+    normalize : optional: bool. default: True.
+          - If True, the window sums are divided by `w0 * w1`.
+
+    Returns
+    ---------
+
+    output : af.Array
+           - The image after the box filter is applied.
+
+    Note
+    ----
+    - The window sums are computed from an integral image, the cost does not depend on the window size.
+    - The edges are zero padded. The result matches `convolve2` with a kernel of ones.
+
+    """
+    output = _window_sums(image, w0, w1, (w0 - 1) // 2, (w1 - 1) // 2)
+    if normalize:
+        output = output / float(w0 * w1)
+    return output
+
+def rect_sums(integral, r0, c0, r1, c1):
+    """
+    Find the sums over many rectangles of an image using its integral image.
+
+    Parameters
+    ----------
+    integral : af.Array
+          - The integral image computed by `integral_image`, or
+          - A multi dimensional array representing batch of integral images.
+
+    r0, c0 : af.Array or list of ints.
+          - The first row and column of each rectangle.
+
+    r1, c1 : af.Array or list of ints.
+          - The last row and column of each rectangle (inclusive).
+
+    Returns
+    ---------
+
+    output : af.Array
+           - An array of size [N d2 d3] containing the sum of each of the N rectangles
+             for every image in the batch.
+
+    Note
+    ----
+    All the rectangles are evaluated with four gathers, independent of their size.
+    Rectangles need to lie inside the image.
+
+    """
+    from .arith import cast
+    from .data import moddims
+    from .util import _to_device
+
+    d0, d1, d2, d3 = dim4_to_tuple(integral.dims())
+    r0, c0, r1, c1 = [cast(_to_device(x, Dtype.s32), Dtype.s32) for x in (r0, c0, r1, c1)]
+
+    # Prepend a row and a column of zeros so corners on the first row or
+    # column read zero instead of the previous entry.
+    table = _pad(_pad(integral, 0, 1, 0), 1, 1, 0)
+    table = moddims(table, (d0 + 1) * (d1 + 1), d2 * d3)
+    stride = d0 + 1
+
+    out = (table[(r1 + 1) + (c1 + 1) * stride, :]
+           - table[r0 + (c1 + 1) * stride, :]
+           - table[(r1 + 1) + c0 * stride, :]
+           + table[r0 + c0 * stride, :])
+    return moddims(out, r0.elements(), d2, d3)
+
+def _envelope_levels(n):
+    # Split the positions [0, n) into bisection levels. Each level is a list
+    # of positions with, for each of them, the closest positions of the
+    # previous levels on both sides (-1 and n when there are none).
+    levels = []
+    gaps = [(-1, n)]
+    while len(gaps) > 0:
+        xs, lefts, rights, next_gaps = [], [], [], []
+        for a, b in gaps:
+            x = (a + b) // 2
+            xs.append(x)
+            lefts.append(a)
+            rights.append(b)
+            if x - a > 1:
+                next_gaps.append((a, x))
+            if b - x > 1:
+                next_gaps.append((x, b))
+        levels.append((xs, lefts, rights))
+        gaps = next_gaps
+    return levels
+
+def _lower_envelope(f):
+    # 1 D squared distance transform
+    #     d(x) = min_q (x - q)^2 + f(q)
+    # applied to every column of the [n L] s64 array `f` at once.
+    #
+    # The smallest minimizing q is nondecreasing in x, so the positions are
+    # processed by bisection and the minimum at x is only searched between the
+    # minimizers of its closest processed neighbours. The search ranges of a
+    # level hold at most n - 1 + m candidates per column for m positions, and
+    # are reduced with one segmented scan over the keys (value * n + q), which
+    # gives the minimum and the smallest minimizer together. There are
+    # log2(n) levels and none of them synchronizes with the host.
+    from .algorithm import accum, _scan_dim0
+    from .arith import cast, minof
+    from .data import flat, moddims, tile
+    from .data import range as af_range
+
+    n, num = dim4_to_tuple(f.dims())[0:2]
+    host = __import__("array")
+    ff = flat(f)
+
+    def gather(a, idx, d0):
+        return moddims(a[flat(idx)], d0, num)
+
+    def positions(vals, m):
+        return tile(cast(Array(host.array('i', vals), (m,)), Dtype.s64), 1, num)
+
+    # Minimizer of each processed position, with rows for x = -1 and x = n.
+    amin = constant(0, n + 2, num, dtype=Dtype.s64)
+    amin[n + 1, :] = n - 1
+    amin = flat(amin)
+    out = constant(0, n * num, dtype=Dtype.s64)
+
+    for xs, lefts, rights in _envelope_levels(n):
+        m = len(xs)
+        size = n - 1 + m
+        lines = af_range(m, num, dim=1, dtype=Dtype.s64)
+        x = positions(xs, m)
+        lo = gather(amin, positions(lefts, m) + 1 + lines * (n + 2), m)
+        hi = gather(amin, positions(rights, m) + 1 + lines * (n + 2), m)
+        lens = hi - lo + 1
+        start = accum(lens, 0) - lens
+
+        # Owner of each candidate. Candidates past the last range repeat its last q.
+        marks = constant(0, size * num, dtype=Dtype.s64)
+        marks[flat(start + lines * size)] = 1
+        clines = af_range(size, num, dim=1, dtype=Dtype.s64)
+        owner = flat(accum(moddims(marks, size, num), 0) - 1 + clines * m)
+
+        off = af_range(size, num, dim=0, dtype=Dtype.s64) - gather(flat(start), owner, size)
+        q = minof(gather(flat(lo), owner, size) + off, gather(flat(hi), owner, size))
+        d = gather(flat(x), owner, size) - q
+        key = (d * d + gather(ff, q + clines * n, size)) * n + q
+
+        best = _scan_dim0(flat(key), 'min', owner, n)
+        best = best[flat(start + lens - 1 + lines * size)]
+        amin[flat(x + 1 + lines * (n + 2))] = best % n
+        out[flat(x + lines * n)] = best / n
+
+    return moddims(out, n, num)
+
+def distance_transform(mask, squared = False):
+    """
+    Find the euclidean distance from each pixel to the nearest zero pixel.
+
+    Parameters
+    ----------
+    mask : af.Array
+          - A 2 D arrayfire array representing a binary image, or
+          - A multi dimensional array representing batch of binary images.
+
+    squared : optional: bool. default: False.
+          - If True, the squared distances are returned.
+
+    Returns
+    ---------
+
+    output : af.Array
+           - The distance of each pixel to the closest zero pixel of its image.
+             Zero pixels have a distance of 0.
+           - In images without zero pixels every distance is at least `sqrt(d0^2 + d1^2)`.
+
+    Note
+    ----
+    The exact distances are computed as a lower envelope of parabolas along dimension 0
+    and then dimension 1, using integer arithmetic. Each pass takes log2 of the line length
+    steps that process all the lines of all the images of the batch together, without
+    synchronizing with the host.
+
+    """
+    from .arith import cast, sqrt
+    from .data import moddims, reorder
+
+    d0, d1, d2, d3 = dim4_to_tuple(mask.dims())
+    big = d0 * d0 + d1 * d1 + 1
+
+    f = cast(mask != 0, Dtype.s64) * big
+    f = _lower_envelope(moddims(f, d0, d1 * d2 * d3))
+    f = reorder(moddims(f, d0, d1, d2 * d3), 1, 0, 2)
+    f = _lower_envelope(moddims(f, d1, d0 * d2 * d3))
+    f = reorder(moddims(f, d1, d0, d2 * d3), 1, 0, 2)
+    f = cast(moddims(f, d0, d1, d2, d3), Dtype.f32)
+    return f if squared else sqrt(f)
+
+def reconstruct(marker, mask, conn = CONNECTIVITY.EIGHT, check_interval = 4, max_iter = None):
+    """
+    Run morphological reconstruction by dilation of `marker` under `mask`.
+
+    Parameters
+    ----------
+    marker : af.Array
+          - A 2 D arrayfire array representing the seed image, or
+          - A multi dimensional array representing batch of seed images.
+          - Needs to be less than or equal to `mask` everywhere.
+
+    mask : af.Array
+          - An array of the same size as `marker` limiting the reconstruction.
+
+    conn : optional: af.CONNECTIVITY. default: af.CONNECTIVITY.EIGHT.
+          - Specifies the connectivity of the pixels.
+
+    check_interval : optional: int. default: 4.
+          - Number of dilations between convergence checks.
+
+    max_iter : optional: int. default: None.
+          - Maximum number of dilations. If None, iterate until convergence.
+
+    Returns
+    ---------
+
+    output : af.Array
+           - The reconstructed image.
+
+    Note
+    ----
+    Convergence is checked on the device. The only host synchronization is a single
+    boolean every `check_interval` dilations.
+
+    """
+    from .algorithm import any_true
+    from .arith import minof
+
+    if conn == CONNECTIVITY.EIGHT:
+        se = constant(1, 3, 3)
+    else:
+        se = constant(0, 3, 3)
+        se[1, :] = 1
+        se[:, 1] = 1
+
+    out = minof(marker, mask)
+    it = 0
+    while max_iter is None or it < max_iter:
+        prev = out
+        steps = check_interval
+        if max_iter is not None and max_iter - it < steps:
+            steps = max_iter - it
+        for k in range(steps):
+            out = minof(dilate(out, se), mask)
+        it += steps
+        if not any_true(out != prev):
+            break
+    return out
+
 def regions(image, conn = CONNECTIVITY.FOUR, out_type = Dtype.f32):
     """
     Find the connected components in the image.
@@ -703,6 +1608,101 @@ def regions(image, conn = CONNECTIVITY.FOUR, out_type = Dtype.f32):
                                        conn.value, out_type.value))
     return output
 
+def region_props(labels, image = None):
+    """
+    Find the properties of the connected components in a label image.
+
+    Parameters
+    ----------
+    labels : af.Array
+          - A 2 D arrayfire array where each pixel is labeled with its component number,
+            as returned by `regions`. Label 0 is treated as background.
+
+    image : optional: af.Array. default: None.
+          - A 2 D arrayfire array of the same size as `labels`.
+          - If not None, the intensity sum and mean of every component are computed.
+
+    Returns
+    ---------
+
+    props : dict of af.Array
+          - 'area': The number of pixels of each component.
+          - 'bbox': An array of size [N 4] containing the first row, first column,
+            last row and last column of each component.
+          - 'centroid': An array of size [N 2] containing the mean row and column of each component.
+          - 'sum', 'mean': The intensity sum and mean of each component, only when `image` is given.
+
+          Row `k` of each array holds the properties of label `k + 1`.
+
+    Note
+    ----
+    - The properties of all the components are computed on the device with two sorts and
+      segmented reductions. The only host synchronization is to find the number of labels.
+    - Labels that do not occur in `labels` have an area of 0, their other properties are undefined.
+
+    """
+    from .algorithm import accum, sort, sort_by_key
+    from .algorithm import max as af_max
+    from .arith import cast, minof
+    from .data import flat, join
+    from .data import range as af_range
+    from .device import is_dbl_supported
+    from .util import _segment_sum
+
+    d0, d1 = dim4_to_tuple(labels.dims())[0:2]
+    num = int(af_max(labels))
+    if num <= 0:
+        props = {'area' : Array(), 'bbox' : Array(), 'centroid' : Array()}
+        if image is not None:
+            props['sum'] = Array()
+            props['mean'] = Array()
+        return props
+
+    lab = cast(flat(labels), Dtype.s64)
+    rows = flat(af_range(d0, d1, dim=0, dtype=Dtype.s64))
+    cols = flat(af_range(d0, d1, dim=1, dtype=Dtype.s64))
+
+    # Pixels of label k are in the range [ptr[k], ptr[k + 1]) after sorting by label.
+    counts = cast(histogram(cast(lab, Dtype.s32), num + 1, 0, num + 1), Dtype.s64)
+    ptr = join(0, constant(0, 1, dtype=Dtype.s64), accum(counts))
+
+    # Sorting by (label, row) and (label, column) puts the extents of each
+    # component at the ends of its segment.
+    last = d0 * d1 - 1
+    first_idx = minof(ptr[1:num+1], last)
+    last_idx = minof(ptr[2:num+2] - 1, last)
+    ftype = Dtype.f64 if is_dbl_supported() else Dtype.f32
+
+    key = lab * d0 + rows
+    if image is not None:
+        key, vals = sort_by_key(key, flat(image))
+        vals = cast(vals, ftype)
+    else:
+        key = sort(key)
+    row_sorted = key % d0
+    r0 = key[first_idx] % d0
+    r1 = key[last_idx] % d0
+
+    key = sort(lab * d1 + cols)
+    col_sorted = key % d1
+    c0 = key[first_idx] % d1
+    c1 = key[last_idx] % d1
+
+    stats = [cast(row_sorted, ftype), cast(col_sorted, ftype)]
+    if image is not None:
+        stats.append(vals)
+    sums = _segment_sum(join(1, *stats), ptr[1:num+2], num)
+
+    area = counts[1:num+1]
+    denom = cast(area + (area == 0), ftype)
+    props = {'area' : area,
+             'bbox' : join(1, r0, c0, r1, c1),
+             'centroid' : join(1, sums[:, 0] / denom, sums[:, 1] / denom)}
+    if image is not None:
+        props['sum'] = sums[:, 2]
+        props['mean'] = sums[:, 2] / denom
+    return props
+
 def sobel_derivatives(image, w_len=3):
     """
     Find the sobel derivatives of the image.
@@ -867,6 +1867,77 @@ def rgb2hsv(image):
     safe_call(backend.get().af_rgb2hsv(ct.pointer(output.arr), image.arr))
     return output
 
+def preprocess(batch, out_size, cspace = CSPACE.GRAY, mean = 0.0, std = 1.0, method = INTERP.BILINEAR):
+    """
+    Resize, color convert and normalize a batch of images in one stage.
+
+    Parameters
+    ----------
+    batch : af.Array
+          - A 4 D arrayfire array of size [d0 d1 3 N] containing RGB images, or
+          - A 3 D arrayfire array of size [d0 d1 N] containing gray scale images.
+          - A batch of 3 gray scale images needs to be passed as [d0 d1 1 3].
+
+    out_size : tuple of ints.
+          - `(odim0, odim1)` of the output images.
+
+    cspace : optional: af.CSPACE. default: af.CSPACE.GRAY.
+          - The color space of the output. Gray scale inputs can only be converted to af.CSPACE.GRAY.
+
+    mean : optional: scalar or list of scalars. default: 0.0.
+          - The value subtracted from the output, or one value per channel.
+
+    std : optional: scalar or list of scalars. default: 1.0.
+          - The value the output is divided by, or one value per channel.
+
+    method : optional: af.INTERP. default: af.INTERP.BILINEAR.
+          - Interpolation method used when resizing.
+
+    Returns
+    ---------
+    output : af.Array
+          - An array of size [odim0 odim1 C N] containing `(convert(resize(batch)) - mean) / std`.
+
+    Note
+    ----
+    - The images are resized before they are color converted, so the conversion and all the
+      intermediate arrays are at the output size.
+    - Conversion to gray scale is linear, the result is the same as converting first.
+      HSV conversion is applied to the resized RGB images.
+    - The normalization is lazily evaluated and fused with the first operation that uses the output.
+
+    """
+    from .arith import cast
+
+    dims = dim4_to_tuple(batch.dims())
+    is_color = dims[2] == 3
+    out = resize(batch, odim0=out_size[0], odim1=out_size[1], method=method)
+
+    if out.dtype() not in (Dtype.f32, Dtype.f64):
+        out = cast(out, Dtype.f32)
+
+    if is_color:
+        if cspace == CSPACE.GRAY:
+            out = rgb2gray(out)
+        elif cspace == CSPACE.HSV:
+            out = rgb2hsv(out)
+    elif cspace != CSPACE.GRAY:
+        raise ValueError("Gray scale images can only be preprocessed to af.CSPACE.GRAY")
+
+    if isinstance(mean, (list, tuple)) or isinstance(std, (list, tuple)):
+        from .bcast import broadcast
+        from .data import moddims
+        nc = dim4_to_tuple(out.dims())[2]
+        mean = list(mean) if isinstance(mean, (list, tuple)) else [mean] * nc
+        std = list(std) if isinstance(std, (list, tuple)) else [std] * nc
+        shift = moddims(Array([float(m) for m in mean]), 1, 1, nc)
+        scale = moddims(Array([1.0 / s for s in std]), 1, 1, nc)
+        if out.dtype() == Dtype.f64:
+            shift, scale = cast(shift, Dtype.f64), cast(scale, Dtype.f64)
+        return broadcast(lambda x, m, s: (x - m) * s, out, shift, scale)
+
+    return (out - mean) * (1.0 / std)
+
 def color_space(image, to_type, from_type):
     """
     Convert an image from one color space to another.
@@ -14,6 +14,9 @@ signal processing functions for arrayfire.
 from .library import *
 from .array import *
 
+# Number of plans kept by the backend plan cache, restored by clear_fft_plan_cache.
+_fft_plan_cache_size = 5
+
 def approx1(signal, pos0, method=INTERP.LINEAR, off_grid=0.0):
     """
     Interpolate along a single dimension.
@@ -94,7 +97,7 @@ def approx2(signal, pos0, pos1, method=INTERP.LINEAR, off_grid=0.0):
                                        pos0.arr, pos1.arr, method.value, ct.c_double(off_grid)))
     return output
 
-def fft(signal, dim0 = None , scale = None):
+def fft(signal, dim0 = None , scale = None, inplace = False):
     """
     Fast Fourier Transform: 1D
 
@@ -112,14 +115,25 @@ def fft(signal, dim0 = None , scale = None):
           - Specifies the scaling factor.
           - If None, scale is set to 1.
 
+    inplace: optional: bool. default: False.
+          - If True, the transform overwrites `signal` and no output is allocated.
+          - `signal` needs to be complex and `dim0` needs to be None.
+
     Returns
     -------
 
     output: af.Array
             A complex af.Array containing the full output of the fft.
+            If `inplace` is True, `signal` is returned.
 
     """
 
+    if inplace:
+        if dim0 is not None:
+            raise ValueError("Output size can not be specified for inplace transforms")
+        fft_inplace(signal, scale)
+        return signal
+
     if dim0 is None:
         dim0 = 0
 
@@ -130,7 +144,7 @@ def fft(signal, dim0 = None , scale = None):
     safe_call(backend.get().af_fft(ct.pointer(output.arr), signal.arr, ct.c_double(scale), ct.c_longlong(dim0)))
     return output
 
-def fft2(signal, dim0 = None, dim1 = None , scale = None):
+def fft2(signal, dim0 = None, dim1 = None , scale = None, inplace = False):
     """
     Fast Fourier Transform: 2D
 
@@ -152,13 +166,25 @@ def fft2(signal, dim0 = None, dim1 = None , scale = None):
           - Specifies the scaling factor.
           - If None, scale is set to 1.
 
+    inplace: optional: bool. default: False.
+          - If True, the transform overwrites `signal` and no output is allocated.
+          - `signal` needs to be complex and `dim0` and `dim1` need to be None.
+
     Returns
     -------
 
     output: af.Array
             A complex af.Array containing the full output of the fft.
+            If `inplace` is True, `signal` is returned.
 
     """
+
+    if inplace:
+        if dim0 is not None or dim1 is not None:
+            raise ValueError("Output size can not be specified for inplace transforms")
+        fft2_inplace(signal, scale)
+        return signal
+
     if dim0 is None:
         dim0 = 0
 
@@ -173,7 +199,7 @@ def fft2(signal, dim0 = None, dim1 = None , scale = None):
                                     ct.c_longlong(dim0), ct.c_longlong(dim1)))
     return output
 
-def fft3(signal, dim0 = None, dim1 = None , dim2 = None, scale = None):
+def fft3(signal, dim0 = None, dim1 = None , dim2 = None, scale = None, inplace = False):
     """
     Fast Fourier Transform: 3D
 
@@ -199,13 +225,25 @@ def fft3(signal, dim0 = None, dim1 = None , dim2 = None, scale = None):
           - Specifies the scaling factor.
           - If None, scale is set to 1.
 
+    inplace: optional: bool. default: False.
+          - If True, the transform overwrites `signal` and no output is allocated.
+          - `signal` needs to be complex and `dim0` and `dim1` and `dim2` need to be None.
+
     Returns
     -------
 
     output: af.Array
             A complex af.Array containing the full output of the fft.
+            If `inplace` is True, `signal` is returned.
 
     """
+
+    if inplace:
+        if dim0 is not None or dim1 is not None or dim2 is not None:
+            raise ValueError("Output size can not be specified for inplace transforms")
+        fft3_inplace(signal, scale)
+        return signal
+
     if dim0 is None:
         dim0 = 0
 
@@ -223,7 +261,7 @@ def fft3(signal, dim0 = None, dim1 = None , dim2 = None, scale = None):
                                     ct.c_longlong(dim0), ct.c_longlong(dim1), ct.c_longlong(dim2)))
     return output
 
-def ifft(signal, dim0 = None , scale = None):
+def ifft(signal, dim0 = None , scale = None, inplace = False):
     """
     Inverse Fast Fourier Transform: 1D
 
@@ -241,11 +279,16 @@ def ifft(signal, dim0 = None , scale = None):
           - Specifies the scaling factor.
           - If None, scale is set to 1.0 / (dim0)
 
+    inplace: optional: bool. default: False.
+          - If True, the transform overwrites `signal` and no output is allocated.
+          - `signal` needs to be complex and `dim0` needs to be None.
+
     Returns
     -------
 
     output: af.Array
             A complex af.Array containing the full output of the inverse fft.
+            If `inplace` is True, `signal` is returned.
 
     Note
     ----
@@ -254,6 +297,12 @@ def ifft(signal, dim0 = None , scale = None):
 
     """
 
+    if inplace:
+        if dim0 is not None:
+            raise ValueError("Output size can not be specified for inplace transforms")
+        ifft_inplace(signal, scale)
+        return signal
+
     if dim0 is None:
         dim0 = signal.dims()[0]
 
@@ -264,7 +313,7 @@ def ifft(signal, dim0 = None , scale = None):
     safe_call(backend.get().af_ifft(ct.pointer(output.arr), signal.arr, ct.c_double(scale), ct.c_longlong(dim0)))
     return output
 
-def ifft2(signal, dim0 = None, dim1 = None , scale = None):
+def ifft2(signal, dim0 = None, dim1 = None , scale = None, inplace = False):
     """
     Inverse Fast Fourier Transform: 2D
 
@@ -286,11 +335,16 @@ def ifft2(signal, dim0 = None, dim1 = None , scale = None):
           - Specifies the scaling factor.
           - If None, scale is set to 1.0 / (dim0 * dim1)
 
+    inplace: optional: bool. default: False.
+          - If True, the transform overwrites `signal` and no output is allocated.
+          - `signal` needs to be complex and `dim0` and `dim1` need to be None.
+
     Returns
     -------
 
     output: af.Array
             A complex af.Array containing the full output of the inverse fft.
+            If `inplace` is True, `signal` is returned.
 
     Note
     ----
@@ -299,6 +353,12 @@ def ifft2(signal, dim0 = None, dim1 = None , scale = None):
 
     """
 
+    if inplace:
+        if dim0 is not None or dim1 is not None:
+            raise ValueError("Output size can not be specified for inplace transforms")
+        ifft2_inplace(signal, scale)
+        return signal
+
     dims = signal.dims()
 
     if (len(dims) < 2):
@@ -318,7 +378,7 @@ def ifft2(signal, dim0 = None, dim1 = None , scale = None):
                                      ct.c_longlong(dim0), ct.c_longlong(dim1)))
     return output
 
-def ifft3(signal, dim0 = None, dim1 = None , dim2 = None, scale = None):
+def ifft3(signal, dim0 = None, dim1 = None , dim2 = None, scale = None, inplace = False):
     """
     Inverse Fast Fourier Transform: 3D
 
@@ -344,11 +404,16 @@ def ifft3(signal, dim0 = None, dim1 = None , dim2 = None, scale = None):
           - Specifies the scaling factor.
           - If None, scale is set to 1.0 / (dim0 * dim1 * dim2).
 
+    inplace: optional: bool. default: False.
+          - If True, the transform overwrites `signal` and no output is allocated.
+          - `signal` needs to be complex and `dim0` and `dim1` and `dim2` need to be None.
+
     Returns
     -------
 
     output: af.Array
             A complex af.Array containing the full output of the inverse fft.
+            If `inplace` is True, `signal` is returned.
 
     Note
     ----
@@ -357,6 +422,12 @@ def ifft3(signal, dim0 = None, dim1 = None , dim2 = None, scale = None):
 
     """
 
+    if inplace:
+        if dim0 is not None or dim1 is not None or dim2 is not None:
+            raise ValueError("Output size can not be specified for inplace transforms")
+        ifft3_inplace(signal, scale)
+        return signal
+
     dims = signal.dims()
 
     if (len(dims) < 3):
@@ -379,7 +450,480 @@ def ifft3(signal, dim0 = None, dim1 = None , dim2 = None, scale = None):
                                      ct.c_longlong(dim0), ct.c_longlong(dim1), ct.c_longlong(dim2)))
     return output
 
-def dft(signal, odims=(None, None, None, None), scale = None):
+def _check_inplace(signal):
+    if not signal.is_complex():
+        raise TypeError("Inplace transforms need a complex input, got %s" % signal.dtype())
+
+def fft_inplace(signal, scale = None):
+    """
+    In-place Fast Fourier Transform: 1D
+
+    Parameters
+    ----------
+
+    signal: af.Array
+           A 1 dimensional complex signal or a batch of 1 dimensional complex signals.
+           Contains the output of the fft on exit.
+
+    scale: optional: scalar. default: None.
+          - Specifies the scaling factor.
+          - If None, scale is set to 1.
+
+    """
+    _check_inplace(signal)
+
+    if scale is None:
+        scale = 1.0
+
+    safe_call(backend.get().af_fft_inplace(signal.arr, ct.c_double(scale)))
+
+def fft2_inplace(signal, scale = None):
+    """
+    In-place Fast Fourier Transform: 2D
+
+    Parameters
+    ----------
+
+    signal: af.Array
+           A 2 dimensional complex signal or a batch of 2 dimensional complex signals.
+           Contains the output of the fft on exit.
+
+    scale: optional: scalar. default: None.
+          - Specifies the scaling factor.
+          - If None, scale is set to 1.
+
+    """
+    _check_inplace(signal)
+
+    if scale is None:
+        scale = 1.0
+
+    safe_call(backend.get().af_fft2_inplace(signal.arr, ct.c_double(scale)))
+
+def fft3_inplace(signal, scale = None):
+    """
+    In-place Fast Fourier Transform: 3D
+
+    Parameters
+    ----------
+
+    signal: af.Array
+           A 3 dimensional complex signal or a batch of 3 dimensional complex signals.
+           Contains the output of the fft on exit.
+
+    scale: optional: scalar. default: None.
+          - Specifies the scaling factor.
+          - If None, scale is set to 1.
+
+    """
+    _check_inplace(signal)
+
+    if scale is None:
+        scale = 1.0
+
+    safe_call(backend.get().af_fft3_inplace(signal.arr, ct.c_double(scale)))
+
+def ifft_inplace(signal, scale = None):
+    """
+    In-place Inverse Fast Fourier Transform: 1D
+
+    Parameters
+    ----------
+
+    signal: af.Array
+           A 1 dimensional complex signal or a batch of 1 dimensional complex signals.
+           Contains the output of the inverse fft on exit.
+
+    scale: optional: scalar. default: None.
+          - Specifies the scaling factor.
+          - If None, scale is set to 1.0 / (dim0)
+
+    """
+    _check_inplace(signal)
+
+    if scale is None:
+        dim0 = signal.dims()[0]
+        scale = 1.0/float(dim0)
+
+    safe_call(backend.get().af_ifft_inplace(signal.arr, ct.c_double(scale)))
+
+def ifft2_inplace(signal, scale = None):
+    """
+    In-place Inverse Fast Fourier Transform: 2D
+
+    Parameters
+    ----------
+
+    signal: af.Array
+           A 2 dimensional complex signal or a batch of 2 dimensional complex signals.
+           Contains the output of the inverse fft on exit.
+
+    scale: optional: scalar. default: None.
+          - Specifies the scaling factor.
+          - If None, scale is set to 1.0 / (dim0 * dim1)
+
+    """
+    _check_inplace(signal)
+
+    if scale is None:
+        dims = dim4_to_tuple(signal.dims())
+        scale = 1.0/float(dims[0] * dims[1])
+
+    safe_call(backend.get().af_ifft2_inplace(signal.arr, ct.c_double(scale)))
+
+def ifft3_inplace(signal, scale = None):
+    """
+    In-place Inverse Fast Fourier Transform: 3D
+
+    Parameters
+    ----------
+
+    signal: af.Array
+           A 3 dimensional complex signal or a batch of 3 dimensional complex signals.
+           Contains the output of the inverse fft on exit.
+
+    scale: optional: scalar. default: None.
+          - Specifies the scaling factor.
+          - If None, scale is set to 1.0 / (dim0 * dim1 * dim2)
+
+    """
+    _check_inplace(signal)
+
+    if scale is None:
+        dims = dim4_to_tuple(signal.dims())
+        scale = 1.0/float(dims[0] * dims[1] * dims[2])
+
+    safe_call(backend.get().af_ifft3_inplace(signal.arr, ct.c_double(scale)))
+
+def fft_r2c(signal, dim0 = None , scale = None):
+    """
+    Real to Complex Fast Fourier Transform: 1D
+
+    Parameters
+    ----------
+
+    signal: af.Array
+           A 1 dimensional real signal or a batch of 1 dimensional real signals.
+
+    dim0: optional: int. default: None.
+          - Specifies the size of the output.
+          - If None, dim0 is calculated to be the first dimension of `signal`.
+
+    scale: optional: scalar. default: None.
+          - Specifies the scaling factor.
+          - If None, scale is set to 1.
+
+    Returns
+    -------
+
+    output: af.Array
+            A complex af.Array containing the non-redundant parts of `signal`.
+            The first dimension of the output is `dim0 / 2 + 1`.
+
+    """
+
+    if dim0 is None:
+        dim0 = 0
+
+    if scale is None:
+        scale = 1.0
+
+    output = Array()
+    safe_call(backend.get().af_fft_r2c(ct.pointer(output.arr), signal.arr, ct.c_double(scale), ct.c_longlong(dim0)))
+    return output
+
+def fft2_r2c(signal, dim0 = None, dim1 = None , scale = None):
+    """
+    Real to Complex Fast Fourier Transform: 2D
+
+    Parameters
+    ----------
+
+    signal: af.Array
+           A 2 dimensional real signal or a batch of 2 dimensional real signals.
+
+    dim0: optional: int. default: None.
+          - Specifies the size of the output.
+          - If None, dim0 is calculated to be the first dimension of `signal`.
+
+    dim1: optional: int. default: None.
+          - Specifies the size of the output.
+          - If None, dim1 is calculated to be the second dimension of `signal`.
+
+    scale: optional: scalar. default: None.
+          - Specifies the scaling factor.
+          - If None, scale is set to 1.
+
+    Returns
+    -------
+
+    output: af.Array
+            A complex af.Array containing the non-redundant parts of `signal`.
+            The first dimension of the output is `dim0 / 2 + 1`.
+
+    """
+    if dim0 is None:
+        dim0 = 0
+
+    if dim1 is None:
+        dim1 = 0
+
+    if scale is None:
+        scale = 1.0
+
+    output = Array()
+    safe_call(backend.get().af_fft2_r2c(ct.pointer(output.arr), signal.arr, ct.c_double(scale),
+                                        ct.c_longlong(dim0), ct.c_longlong(dim1)))
+    return output
+
+def fft3_r2c(signal, dim0 = None, dim1 = None , dim2 = None, scale = None):
+    """
+    Real to Complex Fast Fourier Transform: 3D
+
+    Parameters
+    ----------
+
+    signal: af.Array
+           A 3 dimensional real signal or a batch of 3 dimensional real signals.
+
+    dim0: optional: int. default: None.
+          - Specifies the size of the output.
+          - If None, dim0 is calculated to be the first dimension of `signal`.
+
+    dim1: optional: int. default: None.
+          - Specifies the size of the output.
+          - If None, dim1 is calculated to be the second dimension of `signal`.
+
+    dim2: optional: int. default: None.
+          - Specifies the size of the output.
+          - If None, dim2 is calculated to be the third dimension of `signal`.
+
+    scale: optional: scalar. default: None.
+          - Specifies the scaling factor.
+          - If None, scale is set to 1.
+
+    Returns
+    -------
+
+    output: af.Array
+            A complex af.Array containing the non-redundant parts of `signal`.
+            The first dimension of the output is `dim0 / 2 + 1`.
+
+    """
+    if dim0 is None:
+        dim0 = 0
+
+    if dim1 is None:
+        dim1 = 0
+
+    if dim2 is None:
+        dim2 = 0
+
+    if scale is None:
+        scale = 1.0
+
+    output = Array()
+    safe_call(backend.get().af_fft3_r2c(ct.pointer(output.arr), signal.arr, ct.c_double(scale),
+                                        ct.c_longlong(dim0), ct.c_longlong(dim1), ct.c_longlong(dim2)))
+    return output
+
+def _c2r_len(dim, is_odd):
+    return 2 * dim - 1 if is_odd else 2 * (dim - 1)
+
+def fft_c2r(signal, is_odd = False, scale = None):
+    """
+    Complex to Real Fast Fourier Transform: 1D
+
+    Parameters
+    ----------
+
+    signal: af.Array
+           A 1 dimensional signal or a batch of 1 dimensional signals containing
+           the non-redundant parts of a hermitian symmetric spectrum.
+
+    is_odd: optional: Boolean. default: False.
+          - Specifies if the first dimension of the output should be odd.
+          - If True, dim0 is calculated to be 2 * signal.dims()[0] - 1.
+          - If False, dim0 is calculated to be 2 * (signal.dims()[0] - 1).
+
+    scale: optional: scalar. default: None.
+          - Specifies the scaling factor.
+          - If None, scale is set to 1.0 / (dim0)
+
+    Returns
+    -------
+
+    output: af.Array
+            A real af.Array containing the full output of the inverse fft.
+
+    """
+
+    dim0 = _c2r_len(signal.dims()[0], is_odd)
+
+    if scale is None:
+        scale = 1.0/float(dim0)
+
+    output = Array()
+    safe_call(backend.get().af_fft_c2r(ct.pointer(output.arr), signal.arr, ct.c_double(scale), is_odd))
+    return output
+
+def fft2_c2r(signal, is_odd = False, scale = None):
+    """
+    Complex to Real Fast Fourier Transform: 2D
+
+    Parameters
+    ----------
+
+    signal: af.Array
+           A 2 dimensional signal or a batch of 2 dimensional signals containing
+           the non-redundant parts of a hermitian symmetric spectrum.
+
+    is_odd: optional: Boolean. default: False.
+          - Specifies if the first dimension of the output should be odd.
+          - If True, dim0 is calculated to be 2 * signal.dims()[0] - 1.
+          - If False, dim0 is calculated to be 2 * (signal.dims()[0] - 1).
+
+    scale: optional: scalar. default: None.
+          - Specifies the scaling factor.
+          - If None, scale is set to 1.0 / (dim0 * dim1)
+
+    Returns
+    -------
+
+    output: af.Array
+            A real af.Array containing the full output of the inverse fft.
+
+    """
+    dims = dim4_to_tuple(signal.dims())
+    dim0 = _c2r_len(dims[0], is_odd)
+    dim1 = dims[1]
+
+    if scale is None:
+        scale = 1.0/float(dim0 * dim1)
+
+    output = Array()
+    safe_call(backend.get().af_fft2_c2r(ct.pointer(output.arr), signal.arr, ct.c_double(scale), is_odd))
+    return output
+
+def fft3_c2r(signal, is_odd = False, scale = None):
+    """
+    Complex to Real Fast Fourier Transform: 3D
+
+    Parameters
+    ----------
+
+    signal: af.Array
+           A 3 dimensional signal or a batch of 3 dimensional signals containing
+           the non-redundant parts of a hermitian symmetric spectrum.
+
+    is_odd: optional: Boolean. default: False.
+          - Specifies if the first dimension of the output should be odd.
+          - If True, dim0 is calculated to be 2 * signal.dims()[0] - 1.
+          - If False, dim0 is calculated to be 2 * (signal.dims()[0] - 1).
+
+    scale: optional: scalar. default: None.
+          - Specifies the scaling factor.
+          - If None, scale is set to 1.0 / (dim0 * dim1 * dim2).
+
+    Returns
+    -------
+
+    output: af.Array
+            A real af.Array containing the full output of the inverse fft.
+
+    """
+    dims = dim4_to_tuple(signal.dims())
+    dim0 = _c2r_len(dims[0], is_odd)
+    dim1 = dims[1]
+    dim2 = dims[2]
+
+    if scale is None:
+        scale = 1.0/float(dim0 * dim1 * dim2)
+
+    output = Array()
+    safe_call(backend.get().af_fft3_c2r(ct.pointer(output.arr), signal.arr, ct.c_double(scale), is_odd))
+    return output
+
+def set_fft_plan_cache_size(cache_size):
+    """
+    Sets the number of FFT plans kept in the backend plan cache.
+
+    Parameters
+    ----------
+
+    cache_size : int.
+          - Maximum number of plans that are cached.
+          - Setting a value of 0 clears the cache.
+
+    """
+    global _fft_plan_cache_size
+    safe_call(backend.get().af_set_fft_plan_cache_size(ct.c_size_t(cache_size)))
+    if cache_size > 0:
+        _fft_plan_cache_size = cache_size
+
+def clear_fft_plan_cache():
+    """
+    Releases all the FFT plans held by the backend plan cache.
+
+    Note
+    ----
+
+    The cache size is restored to the last non zero value passed to
+    `set_fft_plan_cache_size`, or to the backend default of 5.
+
+    """
+    size = _fft_plan_cache_size
+    set_fft_plan_cache_size(0)
+    set_fft_plan_cache_size(size)
+
+def next_fast_len(n):
+    """
+    Find the next length that is fast to transform.
+
+    Parameters
+    ----------
+
+    n : int.
+        The minimum length.
+
+    Returns
+    -------
+
+    out : int.
+        The smallest integer greater than or equal to `n` with no prime factors other than 2, 3, 5 and 7.
+
+    Examples
+    --------
+
+    >>> import arrayfire as af
+    >>> af.next_fast_len(1021)
+    1024
+    >>> af.next_fast_len(2039)
+    2048
+
+    """
+    if n <= 1:
+        return 1
+
+    while True:
+        m = n
+        for p in (2, 3, 5, 7):
+            while m % p == 0:
+                m //= p
+        if m == 1:
+            return n
+        n += 1
+
+def _transform_dims(signal, odims, fast_len):
+    dims = signal.dims()
+    odims = dim4_to_tuple(odims, default=None)
+    out = []
+    for d in range(len(dims)):
+        dim = odims[d] if odims[d] is not None else dims[d]
+        out.append(next_fast_len(dim) if fast_len else dim)
+    return out
+
+def dft(signal, odims=(None, None, None, None), scale = None, fast_len = False):
 
     """
     Non batched Fourier transform.
@@ -399,6 +943,9 @@ def dft(signal, odims=(None, None, None, None), scale = None):
            - Scale factor for the fourier transform.
            - If none, calculated to be 1.0.
 
+    fast_len: optional: bool. default: False.
+           - If True, the input is zero padded to `next_fast_len` of the output sizes.
+
     Returns
     -------
     output: af.Array
@@ -406,19 +953,17 @@ def dft(signal, odims=(None, None, None, None), scale = None):
 
     """
 
-    odims4 = dim4_to_tuple(odims, default=None)
-
-    dims = signal.dims()
-    ndims = len(dims)
+    odims = _transform_dims(signal, odims, fast_len)
+    ndims = len(odims)
 
     if (ndims == 1):
-        return fft(signal, dims[0], scale)
+        return fft(signal, odims[0], scale)
     elif (ndims == 2):
-        return fft2(signal, dims[0], dims[1], scale)
+        return fft2(signal, odims[0], odims[1], scale)
     else:
-        return fft3(signal, dims[0], dims[1], dims[2], scale)
+        return fft3(signal, odims[0], odims[1], odims[2], scale)
 
-def idft(signal, scale = None, odims=(None, None, None, None)):
+def idft(signal, scale = None, odims=(None, None, None, None), fast_len = False):
     """
     Non batched Inverse Fourier transform.
 
@@ -437,6 +982,9 @@ def idft(signal, scale = None, odims=(None, None, None, None)):
            - Scale factor for the fourier transform.
            - If none, calculated to be 1.0 / signal.elements()
 
+    fast_len: optional: bool. default: False.
+           - If True, the input is zero padded to `next_fast_len` of the output sizes.
+
     Returns
     -------
     output: af.Array
@@ -449,17 +997,15 @@ def idft(signal, scale = None, odims=(None, None, None, None)):
 
     """
 
-    odims4 = dim4_to_tuple(odims, default=None)
-
-    dims = signal.dims()
-    ndims = len(dims)
+    odims = _transform_dims(signal, odims, fast_len)
+    ndims = len(odims)
 
     if (ndims == 1):
-        return ifft(signal, scale, dims[0])
+        return ifft(signal, odims[0], scale)
     elif (ndims == 2):
-        return ifft2(signal, scale, dims[0], dims[1])
+        return ifft2(signal, odims[0], odims[1], scale)
     else:
-        return ifft3(signal, scale, dims[0], dims[1], dims[2])
+        return ifft3(signal, odims[0], odims[1], odims[2], scale)
 
 def convolve1(signal, kernel, conv_mode = CONV_MODE.DEFAULT, conv_domain = CONV_DOMAIN.AUTO):
     """
@@ -510,7 +1056,8 @@ def convolve1(signal, kernel, conv_mode = CONV_MODE.DEFAULT, conv_domain = CONV_
                                          conv_mode.value, conv_domain.value))
     return output
 
-def convolve2(signal, kernel, conv_mode = CONV_MODE.DEFAULT, conv_domain = CONV_DOMAIN.AUTO):
+def convolve2(signal, kernel, conv_mode = CONV_MODE.DEFAULT, conv_domain = CONV_DOMAIN.AUTO,
+              detect_separable = False):
     """
     Convolution: 2D
 
@@ -533,6 +1080,10 @@ def convolve2(signal, kernel, conv_mode = CONV_MODE.DEFAULT, conv_domain = CONV_
             - af.CONV_DOMAIN.FREQ: Performs convolution in frequency domain.
             - af.CONV_DOMAIN.AUTO: Switches between spatial and frequency based on input size.
 
+    detect_separable: optional: bool. default: False.
+            - If True, a single 2 dimensional kernel is copied to the host and checked for being rank 1.
+            - Separable kernels are applied as two 1 dimensional passes using `convolve2_separable`.
+
     Returns
     --------
 
@@ -553,11 +1104,93 @@ def convolve2(signal, kernel, conv_mode = CONV_MODE.DEFAULT, conv_domain = CONV_
     | [m n 1 p] | [m n q 1] | [m n q p] |
 
     """
+    if detect_separable and conv_domain != CONV_DOMAIN.FREQ:
+        factors = _separable_factors(kernel)
+        if factors is not None:
+            return convolve2_separable(signal, factors[0], factors[1], conv_mode)
+
     output = Array()
     safe_call(backend.get().af_convolve2(ct.pointer(output.arr), signal.arr, kernel.arr,
                                          conv_mode.value, conv_domain.value))
     return output
 
+def _separable_factors(kernel, tol = 1E-6):
+    # Return (col, row) such that kernel = col * row.T, or None if the kernel
+    # is not a single real rank 1 matrix. The check runs on the host.
+    dims = dim4_to_tuple(kernel.dims())
+    if dims[2] != 1 or dims[3] != 1 or dims[0] == 1 or dims[1] == 1:
+        return None
+    if not kernel.is_real():
+        return None
+
+    cols = kernel.to_list()
+    pivot, pi, pj = 0, 0, 0
+    for j, col in enumerate(cols):
+        for i, val in enumerate(col):
+            if abs(val) > abs(pivot):
+                pivot, pi, pj = val, i, j
+
+    if pivot == 0:
+        return None
+
+    for j, col in enumerate(cols):
+        scale = col[pi] / float(pivot)
+        for i, val in enumerate(col):
+            if abs(val - cols[pj][i] * scale) > tol * abs(pivot):
+                return None
+
+    from .data import flat
+    return flat(kernel[:, pj]), flat(kernel[pi, :]) / float(pivot)
+
+# Longest 1D kernel accepted by af_convolve2_sep on the CUDA and OpenCL backends.
+_max_sep_filter_len = 31
+
+def convolve2_separable(signal, col_kernel, row_kernel, conv_mode = CONV_MODE.DEFAULT):
+    """
+    Separable Convolution: 2D
+
+    Parameters
+    -----------
+
+    signal: af.Array
+            - A 2 dimensional signal or batch of 2 dimensional signals.
+
+    col_kernel: af.Array
+            - A 1 dimensional kernel applied along the columns (first dimension).
+
+    row_kernel: af.Array
+            - A 1 dimensional kernel applied along the rows (second dimension).
+
+    conv_mode: optional: af.CONV_MODE. default: af.CONV_MODE.DEFAULT.
+            - Specifies if the output does full convolution (af.CONV_MODE.EXPAND) or
+              maintains the same size as input (af.CONV_MODE.DEFAULT).
+
+    Returns
+    --------
+
+    output: af.Array
+          - Output of 2D convolution with the kernel `col_kernel * row_kernel.T`.
+
+    Note
+    -----
+
+    - The cost per pixel is proportional to `len(col_kernel) + len(row_kernel)` instead of their product.
+    - Kernels longer than 31 taps are applied as two dense `convolve2` passes with a column
+      and a row kernel, since the native separable convolution does not support them.
+
+    """
+    nc = col_kernel.elements()
+    nr = row_kernel.elements()
+    if nc > _max_sep_filter_len or nr > _max_sep_filter_len:
+        from .data import moddims
+        output = convolve2(signal, moddims(col_kernel, nc, 1), conv_mode)
+        return convolve2(output, moddims(row_kernel, 1, nr), conv_mode)
+
+    output = Array()
+    safe_call(backend.get().af_convolve2_sep(ct.pointer(output.arr), col_kernel.arr, row_kernel.arr,
+                                             signal.arr, conv_mode.value))
+    return output
+
 def convolve3(signal, kernel, conv_mode = CONV_MODE.DEFAULT, conv_domain = CONV_DOMAIN.AUTO):
     """
     Convolution: 3D
@@ -656,8 +1289,9 @@ def fft_convolve1(signal, kernel, conv_mode = CONV_MODE.DEFAULT):
     signal: af.Array
             - A 1 dimensional signal or batch of 1 dimensional signals.
 
-    kernel: af.Array
+    kernel: af.Array or af.PreparedKernel
             - A 1 dimensional kernel or batch of 1 dimensional kernels.
+            - If af.PreparedKernel, the cached spectrum of the kernel is reused.
 
     conv_mode: optional: af.CONV_MODE. default: af.CONV_MODE.DEFAULT.
             - Specifies if the output does full convolution (af.CONV_MODE.EXPAND) or
@@ -686,6 +1320,9 @@ def fft_convolve1(signal, kernel, conv_mode = CONV_MODE.DEFAULT):
     | [m n 1 p] | [m n q 1] | [m n q p] |
 
     """
+    if isinstance(kernel, PreparedKernel):
+        return kernel.convolve(signal, 1, conv_mode)
+
     output = Array()
     safe_call(backend.get().af_fft_convolve1(ct.pointer(output.arr), signal.arr, kernel.arr,
                                              conv_mode.value))
@@ -701,8 +1338,9 @@ def fft_convolve2(signal, kernel, conv_mode = CONV_MODE.DEFAULT):
     signal: af.Array
             - A 2 dimensional signal or batch of 2 dimensional signals.
 
-    kernel: af.Array
+    kernel: af.Array or af.PreparedKernel
             - A 2 dimensional kernel or batch of 2 dimensional kernels.
+            - If af.PreparedKernel, the cached spectrum of the kernel is reused.
 
     conv_mode: optional: af.CONV_MODE. default: af.CONV_MODE.DEFAULT.
             - Specifies if the output does full convolution (af.CONV_MODE.EXPAND) or
@@ -730,6 +1368,9 @@ def fft_convolve2(signal, kernel, conv_mode = CONV_MODE.DEFAULT):
     | [m n 1 p] | [m n q 1] | [m n q p] |
 
     """
+    if isinstance(kernel, PreparedKernel):
+        return kernel.convolve(signal, 2, conv_mode)
+
     output = Array()
     safe_call(backend.get().af_fft_convolve2(ct.pointer(output.arr), signal.arr, kernel.arr,
                                              conv_mode.value))
@@ -745,8 +1386,9 @@ def fft_convolve3(signal, kernel, conv_mode = CONV_MODE.DEFAULT):
     signal: af.Array
             - A 3 dimensional signal or batch of 3 dimensional signals.
 
-    kernel: af.Array
+    kernel: af.Array or af.PreparedKernel
             - A 3 dimensional kernel or batch of 3 dimensional kernels.
+            - If af.PreparedKernel, the cached spectrum of the kernel is reused.
 
     conv_mode: optional: af.CONV_MODE. default: af.CONV_MODE.DEFAULT.
             - Specifies if the output does full convolution (af.CONV_MODE.EXPAND) or
@@ -772,6 +1414,9 @@ def fft_convolve3(signal, kernel, conv_mode = CONV_MODE.DEFAULT):
     | [m n q p] | [m n q p] | [m n q p] |
 
     """
+    if isinstance(kernel, PreparedKernel):
+        return kernel.convolve(signal, 3, conv_mode)
+
     output = Array()
     safe_call(backend.get().af_fft_convolve3(ct.pointer(output.arr), signal.arr, kernel.arr,
                                              conv_mode.value))
@@ -868,3 +1513,463 @@ def iir(B, A, X):
     Y = Array()
     safe_call(backend.get().af_iir(ct.pointer(Y.arr), B.arr, A.arr, X.arr))
     return Y
+
+def _bmul(lhs, rhs):
+    from .bcast import broadcast
+    return broadcast(lambda a, b: a * b, lhs, rhs)
+
+def _fftn(signal, rank, sizes, is_complex):
+    if is_complex:
+        if rank == 1:
+            return fft(signal, *sizes)
+        elif rank == 2:
+            return fft2(signal, *sizes)
+        else:
+            return fft3(signal, *sizes)
+    else:
+        if rank == 1:
+            return fft_r2c(signal, *sizes)
+        elif rank == 2:
+            return fft2_r2c(signal, *sizes)
+        else:
+            return fft3_r2c(signal, *sizes)
+
+def _ifftn(signal, rank, sizes, is_complex):
+    if is_complex:
+        if rank == 1:
+            return ifft(signal)
+        elif rank == 2:
+            return ifft2(signal)
+        else:
+            return ifft3(signal)
+    else:
+        is_odd = (sizes[0] % 2) == 1
+        if rank == 1:
+            return fft_c2r(signal, is_odd)
+        elif rank == 2:
+            return fft2_c2r(signal, is_odd)
+        else:
+            return fft3_c2r(signal, is_odd)
+
+class PreparedKernel(object):
+    """
+    A convolution kernel whose padded spectrum is cached for FFT based convolution.
+
+    Passing a PreparedKernel instead of an af.Array to `fft_convolve1`, `fft_convolve2`
+    or `fft_convolve3` skips the transform of the kernel, so only the signal is transformed.
+
+    Parameters
+    ----------
+
+    kernel : af.Array
+           A 1, 2 or 3 dimensional kernel or a batch of kernels.
+
+    max_cached : optional: int. default: 4.
+           Maximum number of spectra (one per signal size) that are cached.
+
+    fast_len : optional: bool. default: True.
+           If True, the transforms are zero padded to `next_fast_len` along each dimension.
+           The output is cropped back, so the result does not change.
+
+    Examples
+    --------
+
+    >>> import arrayfire as af
+    >>> kernel = af.PreparedKernel(af.randu(15, 15))
+    >>> for k in range(100):
+    ...     frame = af.randu(640, 480)
+    ...     out = af.fft_convolve2(frame, kernel)
+
+    """
+
+    def __init__(self, kernel, max_cached=4, fast_len=True):
+        self.kernel = kernel
+        self.kdims = dim4_to_tuple(kernel.dims())
+        self.max_cached = max_cached
+        self.fast_len = fast_len
+        self.spectra = {}
+        self.keys = []
+
+    def spectrum(self, rank, sizes, is_complex):
+        """
+        Return the spectrum of the kernel zero padded to `sizes` along the first `rank` dimensions.
+
+        If `is_complex` is False, only the non-redundant half spectrum is returned.
+        """
+        key = (rank, tuple(sizes), is_complex)
+        if key in self.spectra:
+            self.keys.remove(key)
+        else:
+            self.spectra[key] = _fftn(self.kernel, rank, sizes, is_complex)
+            if len(self.keys) == self.max_cached:
+                del self.spectra[self.keys.pop()]
+        self.keys.insert(0, key)
+        return self.spectra[key]
+
+    def _circular(self, signal, rank, sizes):
+        # Circular convolution of the zero padded signal and kernel
+        if self.fast_len:
+            sizes = [next_fast_len(size) for size in sizes]
+
+        if not signal.is_floating():
+            from .arith import cast
+            signal = cast(signal, Dtype.f32)
+
+        is_complex = signal.is_complex() or self.kernel.is_complex()
+        spectrum = self.spectrum(rank, sizes, is_complex)
+        return _ifftn(_bmul(_fftn(signal, rank, sizes, is_complex), spectrum),
+                      rank, sizes, is_complex)
+
+    def convolve(self, signal, rank, conv_mode = CONV_MODE.DEFAULT):
+        """
+        Convolve `signal` with the kernel along its first `rank` dimensions.
+
+        Returns the same output as `fft_convolve1`, `fft_convolve2` or `fft_convolve3`.
+        """
+        sdims = dim4_to_tuple(signal.dims())
+        sizes = [sdims[d] + self.kdims[d] - 1 for d in range(rank)]
+        output = self._circular(signal, rank, sizes)
+
+        index = [slice(None)] * rank
+        for d in range(rank):
+            if conv_mode == CONV_MODE.EXPAND:
+                index[d] = slice(0, sizes[d])
+            else:
+                half = self.kdims[d] // 2
+                index[d] = slice(half, half + sdims[d])
+        return output[tuple(index)]
+
+def _auto_conv_domain2(sdims, kdims):
+    # Domain of a 2D convolution of a signal of size sdims with a kernel of size kdims.
+    # Per output pixel: k0 * k1 multiply adds in the spatial domain, against a
+    # pointwise product and an inverse transform in the frequency domain.
+    import math
+    sdims = dim4_to_tuple(sdims)
+    kdims = dim4_to_tuple(kdims)
+    fft_len = (sdims[0] + kdims[0] - 1) * (sdims[1] + kdims[1] - 1)
+    if kdims[0] * kdims[1] > 3 * math.log(fft_len, 2):
+        return CONV_DOMAIN.FREQ
+    return CONV_DOMAIN.SPATIAL
+
+def convolve_bank(signal, kernels, conv_mode = CONV_MODE.DEFAULT, conv_domain = CONV_DOMAIN.AUTO):
+    """
+    Convolve a 2D signal with a bank of 2D kernels.
+
+    Parameters
+    -----------
+
+    signal: af.Array
+            - A 2 dimensional signal or a batch of 2 dimensional signals along the third dimension.
+
+    kernels: af.Array or af.PreparedKernel
+            - A batch of 2 dimensional kernels stacked along the third or the fourth dimension.
+            - If af.PreparedKernel, the cached spectra are reused across calls.
+
+    conv_mode: optional: af.CONV_MODE. default: af.CONV_MODE.DEFAULT.
+            - Specifies if the output does full convolution (af.CONV_MODE.EXPAND) or
+              maintains the same size as input (af.CONV_MODE.DEFAULT).
+
+    conv_domain: optional: af.CONV_DOMAIN. default: af.CONV_DOMAIN.AUTO.
+            - Specifies the domain in which convolution is performed.
+            - af.CONV_DOMAIN.SPATIAL: Performs convolution in spatial domain.
+            - af.CONV_DOMAIN.FREQ: Performs convolution in frequency domain.
+            - af.CONV_DOMAIN.AUTO: Chooses the domain based on the kernel and signal sizes.
+
+    Returns
+    --------
+
+    output: af.Array
+          - Output of the convolution with every kernel, along the same dimension as `kernels`.
+
+    Note
+    -----
+
+    In the frequency domain the signal is transformed once and multiplied with all the
+    kernel spectra in a single batched operation.
+
+    | Signal    | Kernels   | output    |
+    |:---------:|:---------:|:---------:|
+    | [m n 1 1] | [m n q 1] | [m n q 1] |
+    | [m n 1 1] | [m n 1 q] | [m n 1 q] |
+    | [m n p 1] | [m n 1 q] | [m n p q] |
+
+    """
+    if not isinstance(kernels, PreparedKernel):
+        kernels = PreparedKernel(kernels)
+
+    if conv_domain == CONV_DOMAIN.AUTO:
+        conv_domain = _auto_conv_domain2(signal.dims(), kernels.kdims)
+
+    if conv_domain == CONV_DOMAIN.FREQ:
+        return kernels.convolve(signal, 2, conv_mode)
+    else:
+        return convolve2(signal, kernels.kernel, conv_mode, CONV_DOMAIN.SPATIAL)
+
+class StreamingConvolver(object):
+    """
+    Causal convolution of an unbounded signal processed in chunks.
+
+    Uses the overlap-save method. The spectrum of the kernel is computed once for
+    each transform size and the last `len(kernel) - 1` input samples are carried
+    over between calls. Transforms are padded to `next_fast_len` of the block length.
+
+    Parameters
+    ----------
+
+    kernel : af.Array or af.PreparedKernel
+           A 1 dimensional array containing the filter coefficients.
+
+    max_cached : optional: int. default: 4.
+           Maximum number of kernel spectra (one per chunk length) that are cached.
+
+    Note
+    ----
+
+    - Chunks can have any length and contain a batch of channels along the second dimension.
+    - Concatenating the outputs gives the same result as `af.fir(kernel, signal)` on the whole signal.
+
+    Examples
+    --------
+
+    >>> import arrayfire as af
+    >>> conv = af.StreamingConvolver(af.randu(33))
+    >>> for k in range(10):
+    ...     y = conv(af.randu(65536, 4))
+
+    """
+
+    def __init__(self, kernel, max_cached=4):
+        self.kernel = kernel if isinstance(kernel, PreparedKernel) else PreparedKernel(kernel, max_cached)
+        self.klen = self.kernel.kdims[0]
+        self.history = None
+
+    def reset(self):
+        """
+        Clear the carried over input samples.
+        """
+        self.history = None
+
+    def process(self, chunk):
+        """
+        Convolve the next chunk of the signal.
+
+        Parameters
+        ----------
+
+        chunk : af.Array
+               A 1 dimensional array or a batch of 1 dimensional signals along the second dimension.
+
+        Returns
+        -------
+
+        output : af.Array
+               The filter output for the samples in `chunk`. Same size as `chunk`.
+        """
+        from .data import join
+
+        hlen = self.klen - 1
+        clen = chunk.dims()[0]
+
+        if hlen == 0:
+            block = chunk
+        else:
+            if self.history is None:
+                self.history = _init_history(hlen, chunk)
+            block = join(0, self.history, chunk)
+            self.history = block[clen:clen+hlen]
+
+        n = clen + hlen
+        return self.kernel._circular(block, 1, [n])[hlen:n]
+
+    def flush(self):
+        """
+        Return the remaining `len(kernel) - 1` samples of the convolution.
+
+        The carried over state is cleared afterwards. Returns None if there is no state.
+        """
+        if self.history is None:
+            return None
+
+        tail = self.process(_init_history(self.klen - 1, self.history))
+        self.reset()
+        return tail
+
+    def __call__(self, chunk):
+        return self.process(chunk)
+
+def _init_history(length, chunk):
+    from .data import constant
+    cdims = dim4_to_tuple(chunk.dims())
+    return constant(0, length, cdims[1], cdims[2], cdims[3], dtype=chunk.dtype())
+
+class FIRFilter(object):
+    """
+    Finite impulse response filter that keeps its state between calls.
+
+    Parameters
+    ----------
+
+    B : af.Array
+        A 1 dimensional array containing the coefficients of the filter.
+
+    Note
+    ----
+
+    - Each call filters a chunk of samples. Channels are batched along the second dimension.
+    - The last `len(B) - 1` input samples of each channel are kept on the device.
+    - Concatenating the outputs gives the same result as `af.fir(B, X)` on the whole signal.
+
+    """
+
+    def __init__(self, B):
+        self.B = B
+        self.hlen = B.dims()[0] - 1
+        self.history = None
+
+    def reset(self):
+        """
+        Reset the state of the filter to zeros.
+        """
+        self.history = None
+
+    def process(self, X):
+        """
+        Filter the next chunk of the signal.
+
+        Parameters
+        ----------
+
+        X : af.Array
+            A 1 dimensional array or a batch of 1 dimensional signals along the second dimension.
+
+        Returns
+        -------
+
+        Y : af.Array
+            The output of the filter. Same size as `X`.
+        """
+        from .data import join
+
+        if self.hlen == 0:
+            return fir(self.B, X)
+
+        if self.history is None:
+            self.history = _init_history(self.hlen, X)
+
+        xlen = X.dims()[0]
+        block = join(0, self.history, X)
+        self.history = block[xlen:xlen+self.hlen]
+        return fir(self.B, block)[self.hlen:self.hlen+xlen]
+
+    def __call__(self, X):
+        return self.process(X)
+
+class IIRFilter(object):
+    """
+    Infinite impulse response filter that keeps its state between calls.
+
+    Parameters
+    ----------
+
+    B : af.Array
+        A 1 dimensional array containing the feed forward coefficients of the filter.
+
+    A : af.Array
+        A 1 dimensional array containing the feed back coefficients of the filter.
+
+    Note
+    ----
+
+    - Each call filters a chunk of samples. Channels are batched along the second dimension.
+    - The last `max(len(A), len(B)) - 1` input and output samples of each channel are kept on the device.
+    - Concatenating the outputs gives the same result as `af.iir(B, A, X)` on the whole signal.
+    - The feed back coefficients are copied to the host once, when the filter is created.
+
+    """
+
+    def __init__(self, B, A):
+        from .data import constant
+
+        self.B = B
+        self.A = A
+        self.one = constant(1, 1, dtype=A.dtype())
+        self.hlen = max(B.dims()[0], A.dims()[0]) - 1
+        self.x_history = None
+        self.y_history = None
+
+        # Contribution of the previous outputs to the first `hlen` samples of a chunk:
+        # feedback[n, m] = A[n + hlen - m], for 0 < n + hlen - m < len(A).
+        if self.hlen > 0:
+            a = A.to_list()
+            alen = len(a)
+            fb = [0.0] * (self.hlen * self.hlen)
+            for m in range(self.hlen):
+                for n in range(self.hlen):
+                    k = n + self.hlen - m
+                    if k < alen:
+                        fb[m * self.hlen + n] = a[k]
+            # Build the matrix in double precision for f64 coefficients instead
+            # of rounding them through the f32 list constructor.
+            host = __import__("array")
+            type_char = 'd' if A.dtype() == Dtype.f64 else 'f'
+            self.feedback = Array(host.array(type_char, fb), (self.hlen, self.hlen))
+            if self.feedback.type() != A.type():
+                from .arith import cast
+                self.feedback = cast(self.feedback, A.dtype())
+
+    def reset(self):
+        """
+        Reset the state of the filter to zeros.
+        """
+        self.x_history = None
+        self.y_history = None
+
+    def process(self, X):
+        """
+        Filter the next chunk of the signal.
+
+        Parameters
+        ----------
+
+        X : af.Array
+            A 1 dimensional array or a batch of 1 dimensional signals along the second dimension.
+
+        Returns
+        -------
+
+        Y : af.Array
+            The output of the filter. Same size as `X`.
+        """
+        from .data import join
+        from .blas import matmul
+
+        if self.hlen == 0:
+            return iir(self.B, self.A, X)
+
+        if self.x_history is None:
+            self.x_history = _init_history(self.hlen, X)
+            self.y_history = self.x_history
+
+        hlen = self.hlen
+        xlen = X.dims()[0]
+
+        xs = join(0, self.x_history, X)
+        # Feed forward part, including the previous inputs
+        U = fir(self.B, xs)[hlen:hlen+xlen]
+
+        # Feed back from the previous outputs only affects the first `hlen` samples
+        E = matmul(self.feedback, self.y_history)
+        if xlen <= hlen:
+            U = U - E[0:xlen]
+        else:
+            U[0:hlen] = U[0:hlen] - E
+
+        Y = iir(self.one, self.A, U)
+
+        ys = join(0, self.y_history, Y)
+        self.x_history = xs[xlen:xlen+hlen]
+        self.y_history = ys[xlen:xlen+hlen]
+        return Y
+
+    def __call__(self, X):
+        return self.process(X)
@@ -0,0 +1,386 @@
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+"""
+Iterative solvers for large linear systems.
+"""
+
+import math
+from .library import *
+from .array import *
+from .bcast import broadcast
+from .data import constant
+
+def _bmul(a, b):
+    # Scalars (or rows of per column scalars) are kept on the device
+    # and broadcast across the vectors they scale.
+    return broadcast(lambda x, y: x * y, a, b)
+
+def _bdiv(a, b):
+    return broadcast(lambda x, y: x / y, a, b)
+
+def _dot(x, y):
+    from .algorithm import sum as af_sum
+    return af_sum(x * y, 0)
+
+def _res_norm(r, b_norm):
+    from .algorithm import max as af_max
+    from .arith import sqrt as af_sqrt
+    return af_max(af_sqrt(_dot(r, r)) / b_norm)
+
+def _as_operator(A):
+    if isinstance(A, Array):
+        from .blas import matmul
+        return lambda x: matmul(A, x)
+    elif callable(A):
+        return A
+    else:
+        raise TypeError("A needs to be an af.Array or a callable")
+
+def _as_preconditioner(M, A):
+    if M is None:
+        return lambda r: r
+
+    if isinstance(M, str):
+        if M.lower() != 'jacobi':
+            raise ValueError("Unsupported preconditioner: %s" % M)
+        if not isinstance(A, Array):
+            raise TypeError("Jacobi preconditioner needs A to be an af.Array, "
+                            "pass the diagonal of the operator as M instead")
+        from .data import diag
+        M = diag(A, extract=True)
+
+    if isinstance(M, Array):
+        inv_diag = 1.0 / M
+        return lambda r: _bmul(inv_diag, r)
+    elif callable(M):
+        return M
+    else:
+        raise TypeError("M needs to be None, 'jacobi', an af.Array or a callable")
+
+def _setup(A, b, x0, M):
+    op = _as_operator(A)
+    precond = _as_preconditioner(M, A)
+
+    dims = dim4_to_tuple(b.dims())
+    if x0 is None:
+        x = constant(0, dims[0], dims[1], dtype=b.dtype())
+    else:
+        x = x0.copy()
+
+    from .arith import sqrt as af_sqrt
+    b_norm = af_sqrt(_dot(b, b))
+    # Avoid dividing by zero for homogeneous systems
+    b_norm = b_norm + (b_norm == 0)
+
+    return op, precond, x, b_norm
+
+def _check(k, r, b_norm, tol, check_interval, callback):
+    if ((k + 1) % check_interval) != 0:
+        return False
+    res = _res_norm(r, b_norm)
+    if callback is not None:
+        callback(k + 1, res)
+    return res <= tol
+
+def cg(A, b, x0=None, tol=1E-5, max_iter=None, M=None, callback=None, check_interval=1):
+    """
+    Solve a symmetric positive definite system using the conjugate gradient method.
+
+    Parameters
+    ----------
+
+    A: af.Array or callable
+       - A 2 dimensional arrayfire array representing the coefficients of the system, or
+       - A function that takes an af.Array `x` and returns `A * x`.
+
+    b: af.Array
+       - A 1 or 2 dimensional arrayfire array representing the constants of the system.
+       - Each column of `b` is solved as an independent system.
+
+    x0: optional: af.Array. default: None.
+       - Initial guess for the solution. If None, zeros are used.
+
+    tol: optional: scalar. default: 1E-5.
+       - Relative tolerance for the norm of the residual.
+
+    max_iter: optional: int. default: None.
+       - Maximum number of iterations. If None, it is set to the number of unknowns.
+
+    M: optional: None, str, af.Array or callable. default: None.
+       - If 'jacobi', the diagonal of `A` is used as the preconditioner.
+       - If af.Array, the array is used as the diagonal of a Jacobi preconditioner.
+       - If callable, it is called with the residual and returns the preconditioned residual.
+
+    callback: optional: callable. default: None.
+       - Called as `callback(iteration, residual_norm)` every `check_interval` iterations.
+
+    check_interval: optional: int. default: 1.
+       - Number of iterations between convergence checks.
+
+    Returns
+    -------
+    (x, info): tuple of af.Array and int.
+       - `x` contains the solution.
+       - `info` is 0 if the solver converged, else the number of iterations performed.
+
+    Note
+    ----
+
+    All the vector operations run on the device. The only host synchronization happens
+    once per `check_interval` iterations when checking for convergence.
+
+    """
+    op, precond, x, b_norm = _setup(A, b, x0, M)
+
+    if max_iter is None:
+        max_iter = b.dims()[0]
+
+    r = b - op(x)
+    z = precond(r)
+    p = z
+    rz = _dot(r, z)
+
+    for k in range(max_iter):
+        Ap = op(p)
+        alpha = rz / _dot(p, Ap)
+        x = x + _bmul(alpha, p)
+        r = r - _bmul(alpha, Ap)
+
+        if _check(k, r, b_norm, tol, check_interval, callback):
+            return x, 0
+
+        z = precond(r)
+        rz_new = _dot(r, z)
+        p = z + _bmul(rz_new / rz, p)
+        rz = rz_new
+
+    return x, max_iter
+
+def bicgstab(A, b, x0=None, tol=1E-5, max_iter=None, M=None, callback=None, check_interval=1):
+    """
+    Solve a general system using the biconjugate gradient stabilized method.
+
+    Parameters
+    ----------
+
+    A: af.Array or callable
+       - A 2 dimensional arrayfire array representing the coefficients of the system, or
+       - A function that takes an af.Array `x` and returns `A * x`.
+
+    b: af.Array
+       - A 1 or 2 dimensional arrayfire array representing the constants of the system.
+       - Each column of `b` is solved as an independent system.
+
+    x0: optional: af.Array. default: None.
+       - Initial guess for the solution. If None, zeros are used.
+
+    tol: optional: scalar. default: 1E-5.
+       - Relative tolerance for the norm of the residual.
+
+    max_iter: optional: int. default: None.
+       - Maximum number of iterations. If None, it is set to the number of unknowns.
+
+    M: optional: None, str, af.Array or callable. default: None.
+       - If 'jacobi', the diagonal of `A` is used as the preconditioner.
+       - If af.Array, the array is used as the diagonal of a Jacobi preconditioner.
+       - If callable, it is called with a vector and returns the preconditioned vector.
+
+    callback: optional: callable. default: None.
+       - Called as `callback(iteration, residual_norm)` every `check_interval` iterations.
+
+    check_interval: optional: int. default: 1.
+       - Number of iterations between convergence checks.
+
+    Returns
+    -------
+    (x, info): tuple of af.Array and int.
+       - `x` contains the solution.
+       - `info` is 0 if the solver converged, else the number of iterations performed.
+
+    Note
+    ----
+
+    All the vector operations run on the device. The only host synchronization happens
+    once per `check_interval` iterations when checking for convergence.
+
+    """
+    op, precond, x, b_norm = _setup(A, b, x0, M)
+
+    if max_iter is None:
+        max_iter = b.dims()[0]
+
+    r = b - op(x)
+    r_hat = r
+
+    dims = dim4_to_tuple(b.dims())
+    rho = constant(1, 1, dims[1], dtype=b.dtype())
+    alpha = rho
+    omega = rho
+    v = constant(0, dims[0], dims[1], dtype=b.dtype())
+    p = v
+
+    for k in range(max_iter):
+        rho_new = _dot(r_hat, r)
+        beta = (rho_new / rho) * (alpha / omega)
+        p = r + _bmul(beta, p - _bmul(omega, v))
+
+        p_hat = precond(p)
+        v = op(p_hat)
+        alpha = rho_new / _dot(r_hat, v)
+        s = r - _bmul(alpha, v)
+
+        s_hat = precond(s)
+        t = op(s_hat)
+        omega = _dot(t, s) / _dot(t, t)
+
+        x = x + _bmul(alpha, p_hat) + _bmul(omega, s_hat)
+        r = s - _bmul(omega, t)
+        rho = rho_new
+
+        if _check(k, r, b_norm, tol, check_interval, callback):
+            return x, 0
+
+    return x, max_iter
+
+def _givens_lstsq(H, beta, m):
+    # Solve min || beta * e1 - H * y || for the (m + 1) x m upper Hessenberg
+    # matrix H on the host. Returns the solution and the residual norm.
+    H = [list(row) for row in H]
+    g = [0.0] * (m + 1)
+    g[0] = beta
+
+    for j in range(m):
+        a = H[j][j]
+        b = H[j + 1][j]
+        den = math.hypot(a, b)
+        if den == 0:
+            m = j
+            break
+        c, s = a / den, b / den
+        for k in range(j, m):
+            hjk, hj1k = H[j][k], H[j + 1][k]
+            H[j][k] = c * hjk + s * hj1k
+            H[j + 1][k] = -s * hjk + c * hj1k
+        g[j], g[j + 1] = c * g[j], -s * g[j]
+
+    y = [0.0] * m
+    for j in reversed(range(m)):
+        acc = g[j]
+        for k in range(j + 1, m):
+            acc -= H[j][k] * y[k]
+        y[j] = acc / H[j][j]
+
+    return y, abs(g[m])
+
+def gmres(A, b, x0=None, tol=1E-5, restart=20, max_iter=None, M=None, callback=None):
+    """
+    Solve a general system using the restarted generalized minimal residual method.
+
+    Parameters
+    ----------
+
+    A: af.Array or callable
+       - A 2 dimensional arrayfire array representing the coefficients of the system, or
+       - A function that takes an af.Array `x` and returns `A * x`.
+
+    b: af.Array
+       - A 1 dimensional arrayfire array representing the constants of the system.
+
+    x0: optional: af.Array. default: None.
+       - Initial guess for the solution. If None, zeros are used.
+
+    tol: optional: scalar. default: 1E-5.
+       - Relative tolerance for the norm of the residual.
+
+    restart: optional: int. default: 20.
+       - Number of Arnoldi iterations between restarts.
+
+    max_iter: optional: int. default: None.
+       - Maximum number of restart cycles. If None, it is set to `ceil(n / restart)`.
+
+    M: optional: None, str, af.Array or callable. default: None.
+       - If 'jacobi', the diagonal of `A` is used as the right preconditioner.
+       - If af.Array, the array is used as the diagonal of a Jacobi preconditioner.
+       - If callable, it is called with a vector and returns the preconditioned vector.
+
+    callback: optional: callable. default: None.
+       - Called as `callback(cycle, residual_norm)` after every restart cycle.
+
+    Returns
+    -------
+    (x, info): tuple of af.Array and int.
+       - `x` contains the solution.
+       - `info` is 0 if the solver converged, else the number of restart cycles performed.
+
+    Note
+    ----
+
+    The Arnoldi process runs on the device. The small Hessenberg least squares problem
+    is copied to the host once per restart cycle, which is also when convergence is checked.
+
+    """
+    from .blas import matmul, matmulTN
+    from .arith import sqrt as af_sqrt
+    from .data import join
+
+    op, precond, x, b_norm = _setup(A, b, x0, M)
+
+    n = b.dims()[0]
+    m = restart if restart < n else n
+
+    if max_iter is None:
+        max_iter = int(math.ceil(float(n) / m))
+
+    for cycle in range(max_iter):
+        r = b - op(x)
+        beta = af_sqrt(_dot(r, r))
+        # Guard against division by zero on breakdown. The host side
+        # least squares solve truncates the basis when this happens.
+        V = constant(0, n, m + 1, dtype=b.dtype())
+        V[:, 0] = _bdiv(r, beta + (beta == 0))
+        H = constant(0, m + 1, m, dtype=b.dtype())
+
+        for j in range(m):
+            w = op(precond(V[:, j]))
+            h = matmulTN(V[:, 0:j+1], w)
+            w = w - matmul(V[:, 0:j+1], h)
+            h_norm = af_sqrt(_dot(w, w))
+            V[:, j+1] = _bdiv(w, h_norm + (h_norm == 0))
+            H[0:j+1, j] = h
+            H[j+1, j] = h_norm
+
+        # Single device to host transfer for the whole cycle
+        norms = constant(0, m + 1, 1, dtype=b.dtype())
+        norms[0] = beta
+        norms[1] = b_norm
+        h_host = join(1, H, norms).to_list()
+        beta_host = h_host[m][0]
+        b_norm_host = h_host[m][1]
+        H_host = [[h_host[k][i] for k in range(m)] for i in range(m + 1)]
+
+        y, res = _givens_lstsq(H_host, beta_host, m)
+
+        if len(y) > 0:
+            # Copy the solution back with the precision of the system.
+            host = __import__("array")
+            y = Array(host.array('d' if b.dtype() == Dtype.f64 else 'f', y), (len(y),))
+            if b.type() != y.type():
+                from .arith import cast
+                y = cast(y, b.dtype())
+            x = x + precond(matmul(V[:, 0:len(y)], y))
+
+        res = res / b_norm_host
+        if callback is not None:
+            callback(cycle + 1, res)
+
+        if res <= tol:
+            return x, 0
+
+    return x, max_iter
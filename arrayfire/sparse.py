@@ -0,0 +1,264 @@
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+"""
+Compressed sparse row matrices for arrayfire.
+"""
+
+from .library import *
+from .array import *
+from .data import constant
+from .util import _to_device, _segment_sum
+
+class CSR(object):
+    """
+    A sparse matrix stored in compressed sparse row format.
+
+    Parameters
+    ----------
+
+    values : af.Array
+          - A 1 dimensional array containing the non zero values, sorted by row.
+
+    row_ptr : af.Array
+          - A 1 dimensional s32 array of length `nrows + 1`.
+          - Values of row `i` are in the range `[row_ptr[i], row_ptr[i + 1])`.
+
+    col_idx : af.Array
+          - A 1 dimensional s32 array containing the column of each value.
+
+    shape : tuple of ints.
+          - `(nrows, ncols)` of the matrix.
+
+    Attributes
+    -----------
+
+    values, row_ptr, col_idx : af.Array
+          The device arrays holding the matrix.
+
+    shape : tuple of ints.
+          The shape of the matrix.
+
+    Note
+    ----
+
+    - Use `CSR.from_coo` or `CSR.from_dense` to build a matrix from coordinates or a dense array.
+    - A CSR object is callable and computes `A * x`, so it can be passed to the iterative solvers.
+
+    Examples
+    --------
+
+    >>> import arrayfire as af
+    >>> A = af.sparse.CSR.from_coo([0, 1, 2], [0, 2, 1], [1.0, 2.0, 3.0], (3, 3))
+    >>> x = af.randu(3, 1)
+    >>> af.display(A.spmv(x))
+
+    """
+
+    def __init__(self, values, row_ptr, col_idx, shape):
+        self.values = values
+        self.row_ptr = row_ptr
+        self.col_idx = col_idx
+        self.shape = (int(shape[0]), int(shape[1]))
+        self._rows = None
+
+    @staticmethod
+    def from_coo(rows, cols, values, shape, dtype=Dtype.f32):
+        """
+        Create a CSR matrix from coordinate format.
+
+        Parameters
+        ----------
+
+        rows : af.Array or list of ints.
+              Row index of each value.
+
+        cols : af.Array or list of ints.
+              Column index of each value.
+
+        values : af.Array or list of scalars.
+              The non zero values.
+
+        shape : tuple of ints.
+              `(nrows, ncols)` of the matrix.
+
+        dtype : optional: af.Dtype. default: af.Dtype.f32.
+              Type of the values when they are given as a list.
+
+        Returns
+        -------
+
+        out : af.CSR
+              The sparse matrix. The input does not need to be sorted.
+
+        Note
+        ----
+
+        Duplicate coordinates are kept as separate entries. They are summed by `spmv` and `spmm`.
+        """
+        from .algorithm import sort_by_key, scan, _key_segments
+        from .arith import cast
+        from .data import flip
+
+        nrows, ncols = int(shape[0]), int(shape[1])
+        rows = cast(_to_device(rows, Dtype.s32), Dtype.s64)
+        cols = cast(_to_device(cols, Dtype.s32), Dtype.s64)
+        values = _to_device(values, dtype)
+
+        keys, values = sort_by_key(rows * ncols + cols, values)
+        rows = cast(keys / ncols, Dtype.s32)
+        cols = cast(keys % ncols, Dtype.s32)
+
+        # Each row starts at the first value of its run of equal rows. Empty rows
+        # start where the next non empty row starts, a reversed minimum scan.
+        row_ptr = constant(rows.elements(), nrows + 1, dtype=Dtype.s32)
+        if rows.elements() > 0:
+            first = _key_segments(rows)[1]
+            row_ptr[rows[first]] = cast(first, Dtype.s32)
+            row_ptr = flip(scan(flip(row_ptr), 0, 'min'))
+
+        out = CSR(values, row_ptr, cols, (nrows, ncols))
+        out._rows = rows
+        return out
+
+    @staticmethod
+    def from_dense(dense):
+        """
+        Create a CSR matrix from a dense 2 dimensional array.
+
+        Parameters
+        ----------
+
+        dense : af.Array
+              A 2 dimensional array.
+
+        Returns
+        -------
+
+        out : af.CSR
+              The sparse matrix containing the non zero elements of `dense`.
+        """
+        from .algorithm import where
+        from .data import flat
+
+        dims = dim4_to_tuple(dense.dims())
+        idx = where(dense != 0)
+        values = flat(dense)[idx]
+        return CSR.from_coo(idx % dims[0], idx / dims[0], values, (dims[0], dims[1]))
+
+    def nnz(self):
+        """
+        Return the number of stored values.
+        """
+        return self.values.elements()
+
+    def dtype(self):
+        """
+        Return the data type of the values as a arrayfire.Dtype enum value.
+        """
+        return self.values.dtype()
+
+    def rows(self):
+        """
+        Return the row index of each stored value as an af.Array.
+        """
+        if self._rows is None:
+            from .algorithm import scan, where
+            from .arith import cast
+
+            nnz = self.nnz()
+            nrows = self.shape[0]
+            if nrows == 1 or nnz == 0:
+                self._rows = constant(0, nnz, dtype=Dtype.s32)
+            else:
+                # Write the index of each non empty row at its first value, the
+                # starts are distinct, and fill the rest with a maximum scan.
+                ptr = self.row_ptr
+                nonempty = where(ptr[1:nrows+1] > ptr[0:nrows])
+                starts = constant(0, nnz, dtype=Dtype.s32)
+                starts[ptr[nonempty]] = cast(nonempty, Dtype.s32)
+                self._rows = scan(starts, 0, 'max')
+        return self._rows
+
+    def to_dense(self):
+        """
+        Convert the matrix to a dense af.Array.
+
+        Note
+        ----
+
+        Duplicate entries are not summed, only one of them is kept.
+        """
+        nrows, ncols = self.shape
+        dense = constant(0, nrows, ncols, dtype=self.dtype())
+        if self.nnz() > 0:
+            from .data import flat, moddims
+            dense = flat(dense)
+            dense[self.rows() + self.col_idx * nrows] = self.values
+            dense = moddims(dense, nrows, ncols)
+        return dense
+
+    def spmv(self, x):
+        """
+        Sparse matrix - dense vector multiplication.
+
+        Parameters
+        ----------
+
+        x : af.Array
+            A 1 dimensional array of length `ncols`.
+
+        Returns
+        -------
+
+        y : af.Array
+            A 1 dimensional array of length `nrows` containing `A * x`.
+        """
+        return self.spmm(x)
+
+    def spmm(self, X):
+        """
+        Sparse matrix - dense matrix multiplication.
+
+        Parameters
+        ----------
+
+        X : af.Array
+            A 2 dimensional array of size `[ncols, k]`.
+
+        Returns
+        -------
+
+        Y : af.Array
+            A 2 dimensional array of size `[nrows, k]` containing `A * X`.
+
+        Note
+        ----
+
+        The products are gathered using `col_idx` and reduced per row with a prefix sum.
+        """
+        nrows, ncols = self.shape
+        dims = dim4_to_tuple(X.dims())
+        if dims[0] != ncols:
+            raise ValueError("Dimension mismatch: matrix has %d columns, input has %d rows"
+                             % (ncols, dims[0]))
+
+        if self.nnz() == 0:
+            return constant(0, nrows, dims[1], dtype=X.dtype())
+
+        from .data import tile
+        prod = tile(self.values, 1, dims[1]) * X[self.col_idx, :]
+        return _segment_sum(prod, self.row_ptr, nrows)
+
+    def __call__(self, x):
+        return self.spmm(x)
+
+    def __repr__(self):
+        return 'Type: arrayfire.sparse.CSR()\nShape: %s\nNon zeros: %d' % \
+            (self.shape, self.nnz())
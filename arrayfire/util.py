@@ -51,6 +51,44 @@ def implicit_dtype(number, a_dtype):
 
     return n_dtype
 
+def _to_device(a, dtype):
+    # Copy a list of host values to an af.Array of type `dtype`.
+    from .array import Array
+    if isinstance(a, Array):
+        return a
+    host = __import__("array")
+    return Array(host.array(to_typecode[dtype.value], a))
+
+def _segment_sum(vals, row_ptr, nrows):
+    # Sum consecutive segments of `vals` along the first dimension. Values of
+    # segment `i` are in the range [row_ptr[i], row_ptr[i + 1]). Each segment is
+    # reduced on its own with a segmented scan instead of taking differences of
+    # one running total, which loses precision when there are many values.
+    from .algorithm import accum, _scan_dim0
+    from .algorithm import max as af_max
+    from .arith import cast
+    from .data import constant, join
+
+    dims = dim4_to_tuple(vals.dims())
+    n = dims[0]
+    start = row_ptr[0:nrows]
+    end = row_ptr[1:nrows+1]
+
+    # Mark the segment boundaries, repeated boundaries of empty segments are
+    # marked once. Values before row_ptr[0], in each segment and after
+    # row_ptr[nrows] get distinct segment ids.
+    marks = constant(0, n + 1, dtype=Dtype.u32)
+    marks[row_ptr[0:nrows+1]] = 1
+    seg = accum(marks)[0:n]
+    span = int(af_max(end - start))
+    csum = _scan_dim0(vals, 'add', seg, span)
+
+    # Empty segments read the row of zeros appended at index n.
+    zero = constant(0, 1, dims[1], dtype=vals.dtype())
+    nonempty = cast(end > start, row_ptr.dtype())
+    idx = (end - 1) * nonempty + n * (1 - nonempty)
+    return join(0, csum, zero)[idx, :]
+
 def dim4_to_tuple(dims, default=1):
     assert(isinstance(dims, tuple))
 
@@ -33,7 +33,179 @@ def hamming_matcher(query, database, dim = 0, num_nearest = 1):
                                                ct.c_longlong(dim), ct.c_longlong(num_nearest)))
     return index, dist
 
-def match_template(image, template, match_type = MATCH.SAD):
+def _match_template_freq(image, template, match_type):
+    # Normalized cross correlation with the numerator computed in the frequency
+    # domain and the window statistics computed from integral images.
+    from .algorithm import sum as af_sum
+    from .arith import cast, maxof, sqrt
+    from .bcast import broadcast
+    from .data import flip
+    from .image import _window_sums
+    from .signal import PreparedKernel
+
+    ftype = Dtype.f64 if Dtype.f64 in (image.dtype(), template.dtype()) else Dtype.f32
+    image = cast(image, ftype)
+    template = cast(template, ftype)
+
+    d0, d1 = dim4_to_tuple(image.dims())[0:2]
+    t0, t1 = dim4_to_tuple(template.dims())[0:2]
+    area = t0 * t1
+
+    if match_type == MATCH.ZNCC:
+        t_mean = af_sum(af_sum(template, 0), 1) / area
+        template = broadcast(lambda t, m: t - m, template, t_mean)
+    t_norm = af_sum(af_sum(template * template, 0), 1)
+
+    # Correlation is convolution with the flipped template. Shift the full
+    # output so each window starts at the pixel it is reported at.
+    kernel = PreparedKernel(flip(flip(template, 0), 1))
+    num = kernel.convolve(image, 2, CONV_MODE.EXPAND)[t0-1:t0-1+d0, t1-1:t1-1+d1]
+
+    energy = _window_sums(image * image, t0, t1, 0, 0)
+    if match_type == MATCH.ZNCC:
+        total = _window_sums(image, t0, t1, 0, 0)
+        energy = maxof(energy - total * total / area, 0)
+
+    den = broadcast(lambda e, t: sqrt(e * t), energy, t_norm)
+    return num / (den + (den == 0)) * (den != 0)
+
+def match_template(image, template, match_type = MATCH.SAD, conv_domain = CONV_DOMAIN.AUTO):
+    """
+    Find the match of a template in an image.
+
+    Parameters
+    ----------
+    image : af.Array
+          - A 2 D arrayfire array representing an image, or
+          - A multi dimensional array representing batch of images.
+
+    template : af.Array
+          - A 2 D arrayfire array representing the template.
+
+    match_type : optional: af.MATCH. default: af.MATCH.SAD.
+          - Specifies the match function metric.
+
+    conv_domain : optional: af.CONV_DOMAIN. default: af.CONV_DOMAIN.AUTO.
+          - af.CONV_DOMAIN.SPATIAL: Evaluates the metric directly for every window.
+          - af.CONV_DOMAIN.FREQ: Computes the correlation using FFTs and the window statistics
+            using integral images. Only af.MATCH.NCC and af.MATCH.ZNCC are supported.
+          - af.CONV_DOMAIN.AUTO: Uses the frequency domain for af.MATCH.NCC and af.MATCH.ZNCC
+            when the template is large enough.
+
+    Returns
+    ---------
+    out : af.Array
+          - An array of the same size as `image` containing the metric for the window
+            starting at each pixel.
+
+    """
+    if conv_domain == CONV_DOMAIN.AUTO:
+        conv_domain = CONV_DOMAIN.SPATIAL
+        if match_type in (MATCH.NCC, MATCH.ZNCC):
+            from .signal import _auto_conv_domain2
+            conv_domain = _auto_conv_domain2(image.dims(), template.dims())
+
+    if conv_domain == CONV_DOMAIN.FREQ:
+        if match_type not in (MATCH.NCC, MATCH.ZNCC):
+            raise ValueError("Only af.MATCH.NCC and af.MATCH.ZNCC are supported in the frequency domain")
+        return _match_template_freq(image, template, match_type)
+
     out = Array()
-    safe_call(backend.get().af_match_template(ct.pointer(out.arr), image.arr, template.arr, match_type))
+    safe_call(backend.get().af_match_template(ct.pointer(out.arr), image.arr, template.arr,
+                                              match_type.value))
     return out
+
+def _peak_offsets(corr):
+    # Locate the peak of each correlation surface in the batch and refine it
+    # with a parabolic fit along both dimensions. Everything stays on the device.
+    from .algorithm import imax
+    from .arith import cast
+    from .data import flat, join, moddims
+    from .data import range as af_range
+
+    d0, d1, d2, d3 = dim4_to_tuple(corr.dims())
+    num = d2 * d3
+    peak, idx = imax(moddims(corr, d0 * d1, num), 0)
+    idx = cast(flat(idx), Dtype.s32)
+    i0 = idx % d0
+    i1 = idx / d0
+    base = flat(af_range(1, num, dim=1, dtype=Dtype.s32)) * (d0 * d1)
+    vals = flat(corr)
+
+    def at(k0, k1):
+        return vals[(k0 + d0) % d0 + ((k1 + d1) % d1) * d0 + base]
+
+    def refine(center, prev, nxt):
+        den = prev - 2 * center + nxt
+        return (prev - nxt) / (2 * (den + (den == 0))) * (den != 0)
+
+    center = at(i0, i1)
+    off0 = refine(center, at(i0 - 1, i1), at(i0 + 1, i1))
+    off1 = refine(center, at(i0, i1 - 1), at(i0, i1 + 1))
+
+    # Peaks past the middle correspond to negative shifts.
+    s0 = cast(i0 - d0 * (i0 > d0 // 2), Dtype.f32) + off0
+    s1 = cast(i1 - d1 * (i1 > d1 // 2), Dtype.f32) + off1
+    return join(1, s0, s1), flat(peak)
+
+def phase_correlate_batch(ref, moving):
+    """
+    Estimate the translation between a reference image and a batch of images using phase correlation.
+
+    Parameters
+    ----------
+    ref : af.Array
+          - A 2 D arrayfire array representing the reference image, or
+          - A batch of reference images of the same size as `moving`.
+
+    moving : af.Array
+          - A 2 D arrayfire array representing an image, or
+          - A multi dimensional array representing batch of images.
+
+    Returns
+    ---------
+    (shifts, confidence) : tuple of af.Array
+          - `shifts` of size [N 2] containing the sub pixel shift along dimension 0 and 1,
+            such that `moving` is approximately `af.shift(ref, shifts[k, 0], shifts[k, 1])`.
+          - `confidence` of size [N] containing the height of each correlation peak, close to 1
+            for a pure translation and close to 0 for unrelated images.
+
+    Note
+    ----
+    All the computation happens on the device and the results are returned as device arrays,
+    nothing is copied to the host.
+
+    """
+    from .arith import abs as af_abs
+    from .arith import conjg, real
+    from .bcast import broadcast
+    from .signal import fft2, ifft2
+
+    cross = broadcast(lambda g, f: g * conjg(f), fft2(moving), fft2(ref))
+    cross = cross / (af_abs(cross) + 1E-12)
+    return _peak_offsets(real(ifft2(cross)))
+
+def phase_correlate(ref, moving):
+    """
+    Estimate the translation between two images using phase correlation.
+
+    Parameters
+    ----------
+    ref : af.Array
+          - A 2 D arrayfire array representing the reference image.
+
+    moving : af.Array
+          - A 2 D arrayfire array of the same size as `ref`.
+
+    Returns
+    ---------
+    ((shift0, shift1), confidence) : tuple
+          - The sub pixel shift along dimension 0 and 1, such that `moving` is
+            approximately `af.shift(ref, shift0, shift1)`.
+          - The height of the correlation peak.
+
+    """
+    from .data import join
+    shifts, confidence = phase_correlate_batch(ref, moving)
+    res = join(1, shifts, confidence).to_list()
+    return (res[0][0], res[1][0]), res[2][0]
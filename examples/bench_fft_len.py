@@ -0,0 +1,46 @@
+#!/usr/bin/python
+
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+from time import time
+import arrayfire as af
+
+def bench(func, iters=10):
+    # Reduce the output to force evaluation of lazily evaluated expressions
+    af.sum(af.abs(func()))
+    start = time()
+    for k in range(iters):
+        af.sum(af.abs(func()))
+    end = time()
+    return 1000 * (end - start) / iters
+
+def bench_dft(sizes=(1021, 2039, 4093)):
+    for n in sizes:
+        a = af.randu(n, n)
+        t_raw = bench(lambda: af.dft(a))
+        t_fast = bench(lambda: af.dft(a, fast_len=True))
+        print("dft %5d x %5d: %8.3f ms, padded to %5d: %8.3f ms" % \
+              (n, n, t_raw, af.next_fast_len(n), t_fast))
+
+def bench_fft_convolve(sizes=(1021, 2039), klen=15):
+    kernel = af.randu(klen, klen)
+    raw = af.PreparedKernel(kernel, fast_len=False)
+    fast = af.PreparedKernel(kernel)
+    for n in sizes:
+        a = af.randu(n, n)
+        t_raw = bench(lambda: af.fft_convolve2(a, raw))
+        t_fast = bench(lambda: af.fft_convolve2(a, fast))
+        print("fft_convolve2 %5d x %5d: %8.3f ms, padded to %5d: %8.3f ms" % \
+              (n, n, t_raw, af.next_fast_len(n + klen - 1), t_fast))
+
+if __name__ == "__main__":
+    af.info()
+    bench_dft()
+    bench_fft_convolve()
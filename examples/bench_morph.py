@@ -0,0 +1,38 @@
+#!/usr/bin/python
+
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+from time import time
+import arrayfire as af
+
+def bench(func, iters=10):
+    # Reduce the output to force evaluation of lazily evaluated expressions
+    af.sum(func())
+    start = time()
+    for k in range(iters):
+        af.sum(func())
+    end = time()
+    return 1000 * (end - start) / iters
+
+def bench_morph(d0=1024, d1=1024, sizes=(3, 5, 11, 21, 31, 51)):
+    image = af.randu(d0, d1)
+    print("image: %d x %d" % (d0, d1))
+    for k in sizes:
+        mask = af.constant(1, k, k)
+        t_dilate = bench(lambda: af.dilate(image, mask))
+        t_open = bench(lambda: af.opening(image, mask))
+        t_tophat = bench(lambda: af.top_hat(image, mask))
+        t_maxfilt = bench(lambda: af.maxfilt(image, k, k))
+        print("mask %2d x %2d: dilate %8.3f ms, opening %8.3f ms, top hat %8.3f ms, maxfilt %8.3f ms" % \
+              (k, k, t_dilate, t_open, t_tophat, t_maxfilt))
+
+if __name__ == "__main__":
+    af.info()
+    bench_morph()
@@ -0,0 +1,40 @@
+#!/usr/bin/python
+
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+from time import time
+import arrayfire as af
+
+def bench(func, iters=10):
+    # Reduce the output to force evaluation of lazily evaluated expressions
+    af.sum(func())
+    start = time()
+    for k in range(iters):
+        af.sum(func())
+    end = time()
+    return 1000 * (end - start) / iters
+
+def bench_separable(d0=1024, d1=1024, batch=1, sizes=(3, 7, 15, 31, 63)):
+    image = af.randu(d0, d1, batch)
+    print("image: %d x %d x %d" % (d0, d1, batch))
+    for k in sizes:
+        col = af.randu(k, 1)
+        row = af.randu(k, 1)
+        kernel = af.matmulNT(col, row)
+        t_dense = bench(lambda: af.convolve2(image, kernel, conv_domain=af.CONV_DOMAIN.SPATIAL))
+        t_auto = bench(lambda: af.convolve2(image, kernel, detect_separable=True))
+        t_sep = bench(lambda: af.convolve2_separable(image, col, row))
+        print("kernel %2d x %2d: dense %8.3f ms, detected %8.3f ms, separable %8.3f ms" % \
+              (k, k, t_dense, t_auto, t_sep))
+
+if __name__ == "__main__":
+    af.info()
+    bench_separable()
+    bench_separable(256, 256, 16)
@@ -0,0 +1,40 @@
+#!/usr/bin/python
+
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+from time import time
+import arrayfire as af
+
+def bench(func, iters=10):
+    # Reduce the output to force evaluation of lazily evaluated expressions
+    af.sum(func())
+    start = time()
+    for k in range(iters):
+        af.sum(func())
+    end = time()
+    return 1000 * (end - start) / iters
+
+def bench_spmv(n=4096, densities=(0.001, 0.01, 0.1), cols=1):
+    for density in densities:
+        a = af.randu(n, n)
+        a = a * (a < density)
+        A = af.sparse.CSR.from_dense(a)
+        x = af.randu(n, cols)
+
+        t_dense = bench(lambda: af.matmul(a, x))
+        t_sparse = bench(lambda: A.spmm(x))
+
+        print("n: %d, density: %6.3f, nnz: %9d, dense: %8.3f ms, sparse: %8.3f ms" % \
+              (n, density, A.nnz(), t_dense, t_sparse))
+
+if __name__ == "__main__":
+    af.info()
+    bench_spmv()
+    bench_spmv(cols=16)
@@ -0,0 +1,35 @@
+#!/usr/bin/python
+
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+from time import time
+import arrayfire as af
+
+def bench(func, iters=10):
+    # Reduce the output to force evaluation of lazily evaluated expressions
+    af.sum(func()[0])
+    start = time()
+    for k in range(iters):
+        af.sum(func()[0])
+    end = time()
+    return 1000 * (end - start) / iters
+
+def bench_topk(n=10 * 1000 * 1000, batch=1, ks=(1, 10, 100, 1000, 10000)):
+    scores = af.randu(n, batch)
+    t_sort = bench(lambda: af.sort_index(scores, is_ascending=False))
+    print("n = %d, batch = %d: sort_index %8.3f ms" % (n, batch, t_sort))
+    for k in ks:
+        t_topk = bench(lambda: af.topk(scores, k))
+        print("k = %5d: topk %8.3f ms" % (k, t_topk))
+
+if __name__ == "__main__":
+    af.info()
+    bench_topk()
+    bench_topk(100 * 1000, 64)
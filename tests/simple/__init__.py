@@ -17,5 +17,8 @@ from .image import *
 from .index import *
 from .lapack import *
 from .signal import *
+from .solvers import *
+from .sparse import *
 from .statistics import *
+from .vision import *
 from ._util import tests
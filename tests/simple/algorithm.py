@@ -11,6 +11,11 @@
 import arrayfire as af
 from . import _util
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 def simple_algorithm(verbose = False):
     display_func = _util.display_func(verbose)
     print_func   = _util.print_func(verbose)
@@ -32,6 +37,78 @@ def simple_algorithm(verbose = False):
     display_func(af.max(a, 0))
     display_func(af.max(a, 1))
 
+    mn, mx = af.minmax(a)
+    print_func(mn, mx)
+    assert(mn == af.min(a) and mx == af.max(a))
+    mn, mx = af.minmax(a, 1)
+    display_func(mn)
+    display_func(mx)
+
+    b = af.randu(100, 3)
+    val, idx = af.topk(b, 5)
+    display_func(val)
+    display_func(idx)
+    sv, si = af.sort_index(b, is_ascending=False)
+    assert(af.max(af.abs(val - sv[0:5, :])) == 0)
+    val, idx = af.topk(af.transpose(b), 3, dim=1, largest=False)
+    display_func(val)
+    assert(af.max(af.abs(val - af.transpose(af.sort(b)[0:3, :]))) == 0)
+
+    keys = af.Array([3, 1, 3, 2, 1, 3])
+    vals = af.Array([1, 2, 3, 4, 5, 6])
+    k, v = af.sum_by_key(keys, vals)
+    display_func(k)
+    display_func(v)
+    assert(k.to_list() == [1, 2, 3] and v.to_list() == [7, 4, 10])
+    k, v = af.min_by_key(keys, vals)
+    assert(v.to_list() == [2, 4, 1])
+    k, v = af.max_by_key(keys, af.join(1, vals, -vals))
+    display_func(v)
+    assert(v[:, 0].to_list() == [5, 4, 6])
+    k, c = af.count_by_key(keys)
+    assert(c.to_list() == [2, 1, 3])
+    k, v = af.sum_by_key(af.Array([1, 1, 2, 1]), af.Array([1, 2, 3, 4]), is_sorted=True)
+    assert(k.to_list() == [1, 2, 1] and v.to_list() == [3, 3, 4])
+    display_func(af.scan_by_key(af.Array([1, 1, 2, 2, 2]), af.Array([1, 2, 3, 4, 5])))
+    assert(af.scan_by_key(af.Array([1, 1, 2, 2, 2]), af.Array([1, 2, 3, 4, 5]), 'max').to_list() == [1, 2, 3, 4, 5])
+    assert(af.scan_by_key(af.Array([1, 1, 2, 2, 2]), af.Array([1, 2, 3, 4, 5])).to_list() == [1, 3, 3, 7, 12])
+
+    empty = af.Array()
+    k, v = af.sum_by_key(empty, empty)
+    assert(k.elements() == 0 and v.elements() == 0)
+    k, v = af.max_by_key(empty, empty, is_sorted=True)
+    assert(k.elements() == 0 and v.elements() == 0)
+    k, c = af.count_by_key(empty)
+    assert(k.elements() == 0 and c.elements() == 0)
+    assert(af.scan_by_key(empty, empty).elements() == 0)
+
+    c = af.Array([3, 1, 4, 1, 5, 2])
+    display_func(af.scan(c, op='max'))
+    assert(af.scan(c).to_list() == [3, 4, 8, 9, 14, 16])
+    assert(af.scan(c, op='min').to_list() == [3, 1, 1, 1, 1, 1])
+    assert(af.scan(c, op='add', inclusive=False).to_list() == [0, 3, 4, 8, 9, 14])
+    assert(af.scan(c, op='mul', inclusive=False).to_list() == [1, 3, 3, 12, 12, 60])
+    assert(af.scan(c > 1, op='and').to_list() == [True, False, False, False, False, False])
+
+    if np is not None:
+        b = af.randu(7, 4, 3)
+        bn = np.asarray(b)
+        refs = {'add' : np.cumsum,
+                'mul' : np.cumprod,
+                'min' : np.minimum.accumulate,
+                'max' : np.maximum.accumulate}
+        for op in refs:
+            for dim in range(3):
+                out = np.asarray(af.scan(b, dim, op))
+                assert(np.allclose(out, refs[op](bn, axis=dim), rtol=1E-4))
+        bb = af.randu(9, 5) > 0.3
+        bbn = np.asarray(bb)
+        assert((np.asarray(af.scan(bb, 1, 'and')) == np.logical_and.accumulate(bbn, axis=1)).all())
+        assert((np.asarray(af.scan(bb, 0, 'or')) == np.logical_or.accumulate(bbn, axis=0)).all())
+        ex = np.asarray(af.scan(b, 1, 'max', inclusive=False))
+        assert(np.isinf(ex[:, 0, :]).all())
+        assert(np.allclose(ex[:, 1:, :], np.maximum.accumulate(bn, axis=1)[:, :-1, :]))
+
     display_func(af.count(a, 0))
     display_func(af.count(a, 1))
 
@@ -75,4 +152,23 @@ def simple_algorithm(verbose = False):
     display_func(af.set_intersect(cc, cc, is_unique=True))
     display_func(af.set_intersect(cc, cc, is_unique=False))
 
+    e = af.Array([4, 1, 4, 3, 1, 4])
+    u, idx, inv, cnt = af.unique(e, return_index=True, return_inverse=True, return_counts=True)
+    display_func(u)
+    assert(u.to_list() == [1, 3, 4])
+    assert(idx.to_list() == [1, 3, 0])
+    assert(u[inv].to_list() == e.to_list())
+    assert(cnt.to_list() == [2, 1, 3])
+    assert(af.unique(af.sort(e), is_sorted=True).to_list() == [1, 3, 4])
+    assert(af.set_union(e, af.Array([2, 4, 2])).to_list() == [1, 2, 3, 4])
+    assert(af.set_intersect(e, af.Array([5, 3, 4, 3])).to_list() == [3, 4])
+
+    if np is not None:
+        e = af.Array(list(np.random.randint(0, 50, 1000)))
+        en = np.asarray(e)
+        ref = np.unique(en, return_index=True, return_inverse=True, return_counts=True)
+        out = af.unique(e, True, True, True)
+        for x, y in zip(out, ref):
+            assert((np.asarray(x).ravel() == y.ravel()).all())
+
 _util.tests['algorithm'] = simple_algorithm
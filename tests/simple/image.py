@@ -9,8 +9,35 @@
 ########################################################
 
 import arrayfire as af
+import importlib
+import os
+import shutil
+import tempfile
+import time
 from . import _util
 
+def _shifted_extremes(a, w0, w1, value=None):
+    # Maximum and minimum over a w0 x w1 window centered on each pixel,
+    # computed from shifted copies. The borders are replicated, or filled
+    # with `value` if it is not None.
+    d0, d1, d2 = a.dims()[0:3]
+    h0, h1 = w0 // 2, w1 // 2
+    if value is not None:
+        a = af.join(0, af.constant(value, h0, d1, d2), a, af.constant(value, w0 - h0, d1, d2))
+        a = af.join(1, af.constant(value, d0 + w0, h1, d2), a, af.constant(value, d0 + w0, w1 - h1, d2))
+    hi = lo = None
+    for i in range(-h0, w0 - h0):
+        rows = af.range(d0, dtype=af.Dtype.s32) + i
+        for j in range(-h1, w1 - h1):
+            cols = af.range(d1, dtype=af.Dtype.s32) + j
+            if value is None:
+                shifted = a[af.minof(af.maxof(rows, 0), d0 - 1), af.minof(af.maxof(cols, 0), d1 - 1), :]
+            else:
+                shifted = a[rows + h0, cols + h1, :]
+            hi = shifted if hi is None else af.maxof(hi, shifted)
+            lo = shifted if lo is None else af.minof(lo, shifted)
+    return hi, lo
+
 def simple_image(verbose = False):
     display_func = _util.display_func(verbose)
     print_func   = _util.print_func(verbose)
@@ -25,6 +52,12 @@ def simple_image(verbose = False):
     display_func(af.resize(a, scale=0.5))
     display_func(af.resize(a, odim0=8, odim1=8))
 
+    pyr = af.Pyramid(af.randu(16, 16, 2), levels=3)
+    display_func(pyr[2])
+    display_func(pyr.laplacian(0))
+    assert(len(pyr) == 3 and pyr.gaussian(2).dims() == (4, 4, 2))
+    assert(af.max(af.abs(pyr.collapse() - pyr[0])) < 1E-4)
+
     t = af.randu(3,2)
     display_func(af.transform(a, t))
     display_func(af.rotate(a, 3.14))
@@ -34,6 +67,19 @@ def simple_image(verbose = False):
     h = af.histogram(a, 3)
     display_func(h)
     display_func(af.hist_equal(a, h))
+    hb = af.histogram(af.join(2, a, 2 * a), 3)
+    display_func(hb)
+    assert(af.max(af.abs(hb[:, :, 0] - hb[:, :, 1])) == 0)
+
+    # Integer ramps whose span equals the number of bins bin exactly
+    for span in (100, 1000):
+        ramp = af.moddims(af.range(span + 1, dtype=af.Dtype.s32), span + 1, 1)
+        hr = af.histogram(af.join(2, ramp, ramp + 7), span)
+        ref = af.constant(1, span, dtype=af.Dtype.u32)
+        ref[span - 1] = 2
+        assert(af.max(af.abs(af.flat(hr[:, :, 0]) - ref)) == 0)
+        assert(af.max(af.abs(af.flat(hr[:, :, 1]) - ref)) == 0)
+        assert(af.max(af.abs(hr[:, :, 0] - af.histogram(ramp, span, 0, span))) == 0)
 
     display_func(af.dilate(a))
     display_func(af.erode(a))
@@ -48,8 +94,76 @@ def simple_image(verbose = False):
     display_func(af.minfilt(a))
     display_func(af.maxfilt(a))
 
+    # Compare full images against the extreme of explicitly shifted copies, for
+    # masks on both sides of the size threshold of the separable path.
+    b = 10 * af.randu(20, 18, 2)
+    for w0, w1 in ((7, 5), (5, 5), (3, 3)):
+        m = af.constant(1, w0, w1)
+        hi, lo = _shifted_extremes(b, w0, w1)
+        assert(af.max(af.abs(af.dilate(b, m) - hi)) == 0)
+        assert(af.max(af.abs(af.erode(b, m) - lo)) == 0)
+        assert(af.max(af.abs(af.maxfilt(b, w0, w1, af.PAD.SYM) - hi)) == 0)
+        assert(af.max(af.abs(af.minfilt(b, w0, w1, af.PAD.SYM) - lo)) == 0)
+        hi, lo = _shifted_extremes(b, w0, w1, 0)
+        assert(af.max(af.abs(af.maxfilt(b, w0, w1, af.PAD.ZERO) - hi)) == 0)
+        assert(af.max(af.abs(af.minfilt(b, w0, w1, af.PAD.ZERO) - lo)) == 0)
+    display_func(af.maxfilt(b, 9, 9))
+    display_func(af.dilate(b, af.constant(1, 1, 31)))
+    display_func(af.opening(b, m))
+    display_func(af.closing(b, m))
+    display_func(af.top_hat(b, m))
+    display_func(af.top_hat(b, m, is_black=True))
+    display_func(af.dilate3(10 * af.randu(8, 8, 8), af.constant(1, 3, 3, 5)))
+
     display_func(af.regions(af.round(a) > 3))
 
+    m = af.constant(1, 7, 9, 2)
+    m[2, 3, 0] = 0
+    m[6, 8, 1] = 0
+    dt = af.distance_transform(m, squared=True)
+    display_func(dt)
+    assert(af.sum(dt[0, 0, 0]) == 13 and af.sum(dt[0, 0, 1]) == 100)
+    display_func(af.distance_transform(af.round(a) > 3))
+
+    m = af.randu(11, 8) > 0.3
+    m[5, 3] = 0
+    cols = m.to_list()
+    zeros = [(i, j) for j in range(8) for i in range(11) if not cols[j][i]]
+    ref = [[min((i - zi) ** 2 + (j - zj) ** 2 for zi, zj in zeros) for i in range(11)] for j in range(8)]
+    assert(af.distance_transform(m, squared=True).to_list() == ref)
+
+    marker = af.constant(0, 6, 6)
+    marker[0, 0] = 1
+    rec = af.reconstruct(marker, af.round(a) > 3)
+    display_func(rec)
+    assert(af.sum(rec * (1 - (af.round(a) > 3))) == 0)
+    one = af.reconstruct(marker, af.round(a) > 3, check_interval=4, max_iter=1)
+    assert(af.max(af.abs(one - af.minof(af.dilate(marker), af.round(a) > 3))) == 0)
+
+    lab = af.regions(af.round(a) > 3)
+    props = af.region_props(lab, a)
+    display_func(props['area'])
+    display_func(props['bbox'])
+    display_func(props['centroid'])
+    display_func(props['mean'])
+    assert(af.sum(props['area']) == af.count(lab))
+    assert(abs(af.sum(props['sum']) - af.sum(a * (lab > 0))) < 1E-3)
+    empty = af.region_props(af.constant(0, 6, 6), a)
+    assert(sorted(empty.keys()) == sorted(props.keys()))
+    assert(empty['sum'].elements() == 0 and empty['mean'].elements() == 0)
+
+    sat = af.integral_image(a)
+    display_func(sat)
+    assert(abs(af.sum(sat[-1, -1]) - af.sum(a)) < 1E-3)
+    box = af.box_filter(a, 3, 5, normalize=False)
+    display_func(box)
+    assert(af.max(af.abs(box - af.convolve2(a, af.constant(1, 3, 5)))) < 1E-3)
+    display_func(af.box_filter(a3, 4, 2))
+    rs = af.rect_sums(sat, [0, 1], [0, 2], [5, 3], [5, 4])
+    display_func(rs)
+    assert(abs(af.sum(rs[1]) - af.sum(a[1:4, 2:5])) < 1E-3)
+    display_func(af.rect_sums(af.integral_image(a3), [0, 1], [0, 2], [4, 3], [4, 4]))
+
     dx,dy = af.sobel_derivatives(a)
     display_func(dx)
     display_func(dy)
@@ -64,4 +178,89 @@ def simple_image(verbose = False):
 
     display_func(af.color_space(a, af.CSPACE.RGB, af.CSPACE.GRAY))
 
+    batch = af.randu(64, 64, 3, 4)
+    steps = lambda: (af.resize(af.rgb2gray(batch), odim0=16, odim1=16,
+                               method=af.INTERP.BILINEAR) - 0.5) / 0.25
+    fused = lambda: af.preprocess(batch, (16, 16), af.CSPACE.GRAY, 0.5, 0.25)
+    assert(af.max(af.abs(fused() - steps())) < 1E-4)
+    display_func(af.preprocess(batch, (16, 16), af.CSPACE.RGB, [0.4, 0.5, 0.6], [0.2, 0.2, 0.2]))
+    display_func(af.preprocess(batch, (16, 16), af.CSPACE.HSV))
+
+    # The fused stage should not allocate any full size intermediates
+    mem = []
+    for func in (fused, steps):
+        af.device_gc()
+        mem0 = af.device_mem_info()['alloc']['bytes']
+        af.sum(func())
+        af.sync()
+        mem.append(af.device_mem_info()['alloc']['bytes'] - mem0)
+    assert(mem[0] < mem[1])
+
+def simple_image_io(verbose=False):
+    display_func = _util.display_func(verbose)
+    print_func   = _util.print_func(verbose)
+
+    tmp = tempfile.mkdtemp()
+    try:
+        batch = af.floor(af.randu(16, 12, 5) * 255)
+        pattern = os.path.join(tmp, 'img_%02d.png')
+        info = af.save_images(batch, pattern, workers=2, max_pending=2)
+        print_func(info)
+        assert(info['images'] == 5)
+
+        paths = [pattern % i for i in range(5)]
+        loaded = af.load_images(paths, workers=2)
+        assert(loaded.dims() == batch.dims())
+        assert(af.max(af.abs(loaded - batch)) == 0)
+
+        batches = list(af.load_images(paths, workers=2, batch_size=2, prefetch=1))
+        assert([b.dims() for b in batches] == [(16, 12, 2), (16, 12, 2), (16, 12)])
+        assert(af.max(af.abs(af.join(2, *batches) - batch)) == 0)
+
+        # Dropping an iterator without consuming it should not leave the pool behind
+        af.load_images(paths, batch_size=2)
+
+        # With prefetch=1 the next batch is submitted before the current one is yielded
+        module = importlib.import_module('arrayfire.image')
+        load_on_device = module._load_on_device
+        loaded = []
+        def record(args):
+            loaded.append(args[0])
+            return load_on_device(args)
+        module._load_on_device = record
+        try:
+            it = af.load_images(paths, workers=1, batch_size=2, prefetch=1)
+            next(it)
+            start = time.time()
+            while paths[2] not in loaded and time.time() - start < 10:
+                time.sleep(0.01)
+            assert(paths[2] in loaded)
+            assert(paths[4] not in loaded)
+            it.close()
+        finally:
+            module._load_on_device = load_on_device
+
+        try:
+            af.load_images([])
+            assert(False)
+        except ValueError:
+            pass
+
+        # Single image API with non ASCII and bytes paths
+        name = os.path.join(tmp, u'\u00e9t\u00e9.png')
+        af.save_image(batch[:, :, 0], name)
+        assert(af.max(af.abs(af.load_image(name) - batch[:, :, 0])) == 0)
+        name = os.path.join(tmp, 'bytes.png').encode('ascii')
+        af.save_image(batch[:, :, 1], name)
+        assert(af.max(af.abs(af.load_image(name) - batch[:, :, 1])) == 0)
+
+        try:
+            af.save_image(batch[:, :, 0], os.path.join(tmp, 'missing', 'x.png'))
+            assert(False)
+        except IOError:
+            pass
+    finally:
+        shutil.rmtree(tmp)
+
 _util.tests['image'] = simple_image
+_util.tests['image_io'] = simple_image_io
@@ -33,6 +33,12 @@ def simple_signal(verbose=False):
     display_func(af.real(af.ifft(af.fft(a))))
     display_func(af.real(af.idft(af.dft(a))))
 
+    assert(af.next_fast_len(1021) == 1024)
+    assert(af.next_fast_len(2039) == 2048)
+    assert(af.next_fast_len(11) == 12)
+    display_func(af.dft(a, fast_len=True))
+    display_func(af.idft(af.dft(a, (11,)), fast_len=True))
+
     a = af.randu(4, 4)
     display_func(a)
 
@@ -49,6 +55,49 @@ def simple_signal(verbose=False):
     display_func(af.real(af.ifft3(af.fft3(a))))
     display_func(af.real(af.idft(af.dft(a))))
 
+    a = af.randu(8, 1)
+    display_func(af.fft_r2c(a))
+    display_func(af.fft_c2r(af.fft_r2c(a)))
+
+    a = af.randu(4, 4)
+    display_func(af.fft2_r2c(a))
+    display_func(af.fft2_c2r(af.fft2_r2c(a)))
+
+    a = af.randu(5, 4, 2)
+    display_func(af.fft3_r2c(a))
+    display_func(af.fft3_c2r(af.fft3_r2c(a), is_odd=True))
+
+    a = af.randu(8, 8, dtype=af.Dtype.c32)
+    display_func(af.fft2(a.copy(), inplace=True))
+    af.fft_inplace(a)
+    af.ifft_inplace(a)
+    af.fft3_inplace(a)
+    af.ifft3(a, inplace=True)
+    display_func(a)
+
+    # The inplace transform should not allocate a second buffer for the output
+    a = af.randu(256, 256, dtype=af.Dtype.c32)
+    af.fft2_inplace(a)
+    af.sync()
+    mem0 = af.device_mem_info()['alloc']['bytes']
+    af.fft2_inplace(a)
+    af.ifft2_inplace(a)
+    af.sync()
+    mem1 = af.device_mem_info()['alloc']['bytes']
+    assert(mem1 - mem0 < 256 * 256 * 8)
+
+    af.set_fft_plan_cache_size(8)
+    af.clear_fft_plan_cache()
+
+    a = af.randu(9, 3)
+    b = af.fft_r2c(a)
+    assert(b.dims() == (9 // 2 + 1, 3))
+    assert(af.max(af.abs(af.fft_c2r(b, is_odd=True) - a)) < 1E-5)
+    a = af.randu(8, 6, 2)
+    b = af.fft2_r2c(a)
+    assert(b.dims() == (8 // 2 + 1, 6, 2))
+    assert(af.max(af.abs(af.fft2_c2r(b) - a)) < 1E-5)
+
     a = af.randu(10, 1)
     b = af.randu(3, 1)
     display_func(af.convolve1(a, b))
@@ -63,6 +112,52 @@ def simple_signal(verbose=False):
     display_func(af.convolve(a, b))
     display_func(af.fft_convolve(a, b))
 
+    k = af.PreparedKernel(b, fast_len=False)
+    display_func(af.fft_convolve2(a, k, af.CONV_MODE.EXPAND))
+    k = af.PreparedKernel(b)
+    display_func(af.fft_convolve2(a, k))
+    display_func(af.fft_convolve2(a * 2, k, af.CONV_MODE.EXPAND))
+    assert(af.max(af.abs(af.fft_convolve2(a, k) - af.fft_convolve2(a, b))) < 1E-4)
+
+    c = af.randu(3, 1)
+    r = af.randu(5, 1)
+    ab = af.randu(5, 5, 2)
+    display_func(af.convolve2_separable(ab, c, r))
+    sep = af.matmulNT(c, r)
+    assert(af.max(af.abs(af.convolve2_separable(a, c, r) - af.convolve2(a, sep))) < 1E-4)
+    assert(af.max(af.abs(af.convolve2(ab, sep, detect_separable=True) - af.convolve2(ab, sep))) < 1E-4)
+    display_func(af.convolve2(a, b, detect_separable=True))
+
+    # Kernels longer than the native separable limit fall back to dense passes
+    c = af.randu(41, 1)
+    r = af.randu(35, 1)
+    big = af.randu(80, 70, 2)
+    sep = af.matmulNT(c, r)
+    ref = af.convolve2(big, sep)
+    assert(af.max(af.abs(af.convolve2_separable(big, c, r) - ref)) < 1E-2)
+    assert(af.max(af.abs(af.convolve2(big, sep, detect_separable=True) - ref)) < 1E-2)
+    ref = af.convolve2(big, sep, af.CONV_MODE.EXPAND)
+    assert(af.max(af.abs(af.convolve2_separable(big, c, r, af.CONV_MODE.EXPAND) - ref)) < 1E-2)
+
+    # One call over the bank matches convolving with each kernel separately,
+    # in every domain and with a prepared kernel.
+    b = af.randu(3, 3, 4)
+    display_func(af.convolve_bank(a, b))
+    s = af.randu(5, 5, 2)
+    for mode in (af.CONV_MODE.DEFAULT, af.CONV_MODE.EXPAND):
+        for signal, kernels, pages in ((a, b, 1), (a, af.moddims(b, 3, 3, 1, 4), 1),
+                                       (s, af.moddims(b, 3, 3, 1, 4), 2)):
+            outs = [af.convolve_bank(signal, kernels, mode),
+                    af.convolve_bank(signal, kernels, mode, af.CONV_DOMAIN.SPATIAL),
+                    af.convolve_bank(signal, kernels, mode, af.CONV_DOMAIN.FREQ),
+                    af.convolve_bank(signal, af.PreparedKernel(kernels), mode, af.CONV_DOMAIN.FREQ)]
+            for p in range(pages):
+                for k in range(4):
+                    ref = af.convolve2(signal[:, :, p], b[:, :, k], mode)
+                    for out in outs:
+                        res = out[:, :, k] if kernels is b else out[:, :, p, k]
+                        assert(af.max(af.abs(res - ref)) < 1E-4)
+
     a = af.randu(5, 5, 3)
     b = af.randu(3, 3, 2)
     display_func(af.convolve3(a, b))
@@ -77,4 +172,32 @@ def simple_signal(verbose=False):
     display_func(af.fir(b, x))
     display_func(af.iir(b, a, x))
 
+    b = af.randu(5, 1)
+    x = af.randu(40, 3)
+    conv = af.StreamingConvolver(b)
+    y = af.join(0, conv(x[0:7]), conv(x[7:9]), conv(x[9:40]))
+    display_func(y)
+    display_func(conv.flush())
+    y0 = af.fft_convolve1(x, b, af.CONV_MODE.EXPAND)[0:40]
+    assert(af.max(af.abs(y - y0)) < 1E-4)
+
+    a = af.join(0, af.constant(1, 1), 0.1 * af.randu(3, 1))
+    fir_filt = af.FIRFilter(b)
+    iir_filt = af.IIRFilter(b, a)
+    y = af.join(0, fir_filt(x[0:3]), fir_filt(x[3:40]))
+    assert(af.max(af.abs(y - af.fir(b, x))) < 1E-4)
+    y = af.join(0, iir_filt(x[0:3]), iir_filt(x[3:25]), iir_filt(x[25:40]))
+    assert(af.max(af.abs(y - af.iir(b, a, x))) < 1E-4)
+    iir_filt.reset()
+    display_func(iir_filt(x))
+
+    if af.is_dbl_supported():
+        b = af.randu(5, 1, dtype=af.Dtype.f64)
+        a = af.join(0, af.constant(1, 1, dtype=af.Dtype.f64), 0.1 * af.randu(3, 1, dtype=af.Dtype.f64))
+        x = af.randu(40, 3, dtype=af.Dtype.f64)
+        iir_filt = af.IIRFilter(b, a)
+        y = af.join(0, iir_filt(x[0:3]), iir_filt(x[3:25]), iir_filt(x[25:40]))
+        assert(y.dtype() == af.Dtype.f64)
+        assert(af.max(af.abs(y - af.iir(b, a, x))) < 1E-12)
+
 _util.tests['signal'] = simple_signal
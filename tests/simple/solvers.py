@@ -0,0 +1,72 @@
+#!/usr/bin/python
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+import arrayfire as af
+from . import _util
+
+def simple_solvers(verbose=False):
+    display_func = _util.display_func(verbose)
+    print_func   = _util.print_func(verbose)
+
+    a = af.randu(8, 8)
+    a = af.matmulTN(a, a) + 8 * af.identity(8, 8)
+    x0 = af.randu(8, 2)
+    b = af.matmul(a, x0)
+
+    # The systems are well conditioned, so a relative residual of 1E-5 bounds the
+    # error of the f32 solutions well below 1E-3.
+    def check(x1, info, x0):
+        display_func(x1)
+        print_func(info)
+        assert(info == 0)
+        assert(af.max(af.abs(x1 - x0)) < 1E-3)
+
+    x1, info = af.cg(a, b, max_iter=50)
+    check(x1, info, x0)
+
+    x1, info = af.cg(a, b, M='jacobi', check_interval=4, max_iter=50)
+    check(x1, info, x0)
+
+    x1, info = af.cg(lambda x: af.matmul(a, x), b, M=af.diag(a, extract=True), max_iter=50,
+                     callback=lambda k, res: print_func(k, res))
+    check(x1, info, x0)
+
+    x1, info = af.bicgstab(a, b, max_iter=50)
+    check(x1, info, x0)
+
+    x1, info = af.bicgstab(a, b, M='jacobi', max_iter=50)
+    check(x1, info, x0)
+
+    x1, info = af.bicgstab(lambda x: af.matmul(a, x), b, M=af.diag(a, extract=True),
+                            check_interval=2, max_iter=50)
+    check(x1, info, x0)
+
+    b = b[:, 0]
+    x0 = x0[:, 0]
+    x1, info = af.gmres(a, b, restart=4, max_iter=20)
+    check(x1, info, x0)
+
+    x1, info = af.gmres(a, b, restart=4, max_iter=20, M='jacobi',
+                        callback=lambda k, res: print_func(k, res))
+    check(x1, info, x0)
+
+    x1, info = af.gmres(lambda x: af.matmul(a, x), b, restart=4, max_iter=20,
+                        M=af.diag(a, extract=True))
+    check(x1, info, x0)
+
+    if af.is_dbl_supported():
+        a = af.randu(16, 16, dtype=af.Dtype.f64) + 16 * af.identity(16, 16, dtype=af.Dtype.f64)
+        x0 = af.randu(16, 1, dtype=af.Dtype.f64)
+        b = af.matmul(a, x0)
+        x1, info = af.gmres(a, b, tol=1E-12, restart=4, max_iter=20)
+        assert(info == 0)
+        assert(af.max(af.abs(x1 - x0)) < 1E-10)
+
+_util.tests['solvers'] = simple_solvers
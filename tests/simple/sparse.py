@@ -0,0 +1,63 @@
+#!/usr/bin/python
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+import arrayfire as af
+from . import _util
+
+def simple_sparse(verbose=False):
+    display_func = _util.display_func(verbose)
+    print_func   = _util.print_func(verbose)
+
+    A = af.sparse.CSR.from_coo([2, 0, 1, 2], [1, 0, 2, 2], [3.0, 1.0, 2.0, 4.0], (3, 3))
+    print_func(A, A.nnz())
+    display_func(A.values)
+    display_func(A.row_ptr)
+    display_func(A.col_idx)
+    display_func(A.to_dense())
+
+    x = af.randu(3, 1)
+    display_func(A.spmv(x))
+    display_func(af.matmul(A.to_dense(), x))
+
+    a = af.randu(5, 4)
+    a = a * (a > 0.5)
+    B = af.sparse.CSR.from_dense(a)
+    X = af.randu(4, 3)
+    display_func(B.spmm(X))
+    display_func(af.matmul(a, X))
+    display_func(B.to_dense())
+
+    C = af.sparse.CSR(B.values, B.row_ptr, B.col_idx, B.shape)
+    display_func(C.rows())
+
+    # Rows with many values should not lose precision against the dense product,
+    # and empty rows sum to zero.
+    n = 20000
+    v = af.randu(n, 1)
+    D = af.sparse.CSR.from_coo(af.constant(1, n, dtype=af.Dtype.s32), af.range(n, dtype=af.Dtype.s32),
+                               v, (3, n))
+    y = D.spmv(af.constant(1, n, 1))
+    print_func(y)
+    y = y.to_list()
+    assert(y[0] == 0 and y[2] == 0)
+    assert(abs(y[1] - af.sum(v)) < 1E-3)
+
+    F = af.sparse.CSR.from_coo([3, 0, 3, 0, 5], [0, 1, 2, 3, 4], [1.0, 2.0, 3.0, 4.0, 5.0], (7, 5))
+    assert(F.row_ptr.to_list() == [0, 2, 2, 2, 4, 4, 5, 5])
+    G = af.sparse.CSR(F.values, F.row_ptr, F.col_idx, F.shape)
+    assert(G.rows().to_list() == [0, 0, 3, 3, 5])
+    assert(G.spmv(af.constant(1, 5, 1)).to_list() == [6, 0, 0, 4, 0, 5, 0])
+
+    if af.is_dbl_supported():
+        E = af.sparse.CSR.from_coo([0, 1], [1, 0], [0.1, 0.2], (2, 2), dtype=af.Dtype.f64)
+        assert(E.dtype() == af.Dtype.f64)
+        assert(af.sum(E.to_dense()[0, 1]) == 0.1)
+
+_util.tests['sparse'] = simple_sparse
@@ -0,0 +1,42 @@
+#!/usr/bin/python
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+import arrayfire as af
+from . import _util
+
+def simple_vision(verbose=False):
+    display_func = _util.display_func(verbose)
+    print_func   = _util.print_func(verbose)
+
+    ref = af.randu(32, 32)
+    moving = af.shift(ref, 3, -5)
+    shift, conf = af.phase_correlate(ref, moving)
+    print_func(shift, conf)
+    assert(abs(shift[0] - 3) < 0.5 and abs(shift[1] + 5) < 0.5)
+    assert(conf > 0.5)
+
+    batch = af.join(2, moving, af.shift(ref, -2, 7), ref)
+    shifts, conf = af.phase_correlate_batch(ref, batch)
+    display_func(shifts)
+    display_func(conf)
+    res = shifts.to_list()
+    assert(abs(res[0][1] + 2) < 0.5 and abs(res[1][1] - 7) < 0.5)
+    assert(abs(res[0][2]) < 0.5 and abs(res[1][2]) < 0.5)
+
+    image = af.randu(40, 40, 2)
+    template = image[5:14, 7:18, 0]
+    for match_type in (af.MATCH.NCC, af.MATCH.ZNCC):
+        spatial = af.match_template(image, template, match_type, af.CONV_DOMAIN.SPATIAL)
+        freq = af.match_template(image, template, match_type, af.CONV_DOMAIN.FREQ)
+        display_func(freq)
+        assert(af.max(af.abs(spatial - freq)) < 1E-3)
+    display_func(af.match_template(image, template))
+
+_util.tests['vision'] = simple_vision